@@ -0,0 +1,172 @@
+"""
+Asynchronous, batched Telegram delivery
+───────────────────────────────────────
+• put() never blocks – a background thread does the HTTP work
+• Alerts queued during one sweep go out as a single digest message
+  (flush() marks the end of a sweep; LINGER caps the wait otherwise)
+• Per-chat pacing within Telegram's limits (≈ 20 messages / min in groups)
+• 429 → sleeps for the server's retry_after, then retries
+• put(text, done) reports delivery: done(True) once the message carrying
+  the alert went out, done(False) if it was given up on; drain() waits
+  for everything queued, for one-shot runs that exit afterwards
+• Without a token / chat id nothing is sent; alerts count as delivered
+  (the log line is all there is)
+"""
+
+import logging
+import queue
+import threading
+import time
+
+import requests
+
+import metrics
+
+log = logging.getLogger(__name__)
+
+API_URL = "https://api.telegram.org/bot{token}/sendMessage"
+MIN_INTERVAL = 3.0              # s between messages to one chat (20 / min)
+LINGER = 2.0                    # s to wait for more alerts without a flush()
+MAX_LEN = 4096                  # Telegram message length limit
+RETRIES = 3
+
+_FLUSH = object()
+
+
+class TelegramQueue:
+    """Outbound alert queue with one sender thread."""
+
+    def __init__(self, token: str | None, chat_id: str | None,
+                 min_interval: float = MIN_INTERVAL, linger: float = LINGER):
+        self.url = API_URL.format(token=token)
+        self.chat_id = chat_id
+        self.enabled = bool(token and chat_id)
+        self.min_interval = min_interval
+        self.linger = linger
+        self.session = requests.Session()
+        self.q: queue.Queue = queue.Queue()
+        self.last_sent = 0.0
+        self.thread: threading.Thread | None = None
+        self.lock = threading.Lock()
+        self.pending = 0                          # alerts put, not yet settled
+        self.settled = threading.Condition(self.lock)
+
+    # ── producer side ──
+    def put(self, text: str, done=None) -> None:
+        """Queue *text*; *done(ok)* is called from the sender thread."""
+        if not self.enabled:
+            if done is not None:
+                done(True)
+            return
+        self._ensure_thread()
+        with self.lock:
+            self.pending += 1
+        self.q.put((text, done))
+
+    def flush(self) -> None:
+        """Send whatever was queued since the last flush as one digest."""
+        if self.thread is not None:
+            self.q.put(_FLUSH)
+
+    def drain(self, timeout: float | None = None) -> bool:
+        """flush(), then wait until every queued alert was sent or given up
+        on.  False if *timeout* ran out first."""
+        self.flush()
+        with self.settled:
+            return self.settled.wait_for(lambda: self.pending == 0, timeout)
+
+    def _ensure_thread(self) -> None:
+        with self.lock:
+            if self.thread is None:
+                self.thread = threading.Thread(target=self._run, daemon=True)
+                self.thread.start()
+
+    # ── sender thread ──
+    def _collect(self) -> list[tuple]:
+        """Block for the first alert, then gather until flush or linger."""
+        batch = []
+        while not batch:
+            item = self.q.get()
+            if item is not _FLUSH:
+                batch.append(item)
+        deadline = time.monotonic() + self.linger
+        while True:
+            try:
+                item = self.q.get(timeout=max(deadline - time.monotonic(), 0))
+            except queue.Empty:
+                return batch
+            if item is _FLUSH:
+                return batch
+            batch.append(item)
+
+    def _run(self) -> None:
+        while True:
+            batch = self._collect()
+            for text, members in _pack([text for text, _ in batch]):
+                ok = self._send(text)
+                for i in members:
+                    self._settle(batch[i][1], ok)
+
+    def _settle(self, done, ok: bool) -> None:
+        try:
+            if done is not None:
+                done(ok)
+        except Exception as e:
+            log.exception("Telegram delivery callback failed: %s", e)
+        finally:
+            with self.settled:
+                self.pending -= 1
+                self.settled.notify_all()
+
+    def _send(self, text: str) -> bool:
+        """POST one message; True once Telegram accepted it."""
+        for _ in range(RETRIES):
+            wait = self.last_sent + self.min_interval - time.monotonic()
+            if wait > 0:
+                time.sleep(wait)
+            t0 = time.perf_counter()
+            try:
+                r = self.session.post(self.url, json={"chat_id": self.chat_id,
+                                                      "text": text}, timeout=5)
+            except requests.RequestException as e:
+                metrics.telegram_sends.inc(status="error")
+                log.warning("Telegram send exception: %s", e)
+                time.sleep(self.min_interval)
+                continue
+            self.last_sent = time.monotonic()
+            metrics.telegram_latency.observe(time.perf_counter() - t0)
+            metrics.telegram_sends.inc(status=r.status_code)
+            if r.status_code == 200:
+                return True
+            if r.status_code == 429:
+                try:
+                    retry_after = r.json()["parameters"]["retry_after"]
+                except (ValueError, KeyError, TypeError):
+                    retry_after = 5
+                log.warning("Telegram rate limited, retrying after %ss", retry_after)
+                time.sleep(retry_after)
+                continue
+            log.error("Telegram error %s: %s", r.status_code, r.text[:120])
+            return False
+        log.error("Telegram gave up after %d tries: %s…", RETRIES, text[:60])
+        return False
+
+
+def _pack(lines: list[str]) -> list[tuple[str, list[int]]]:
+    """digest(), plus which lines went into each message."""
+    if len(lines) == 1:
+        return [(lines[0][:MAX_LEN], [0])]
+    out, cur, members = [], f"{len(lines)} alerts", []
+    for i, line in enumerate(lines):
+        if len(cur) + 1 + len(line) > MAX_LEN:
+            out.append((cur, members))
+            cur, members = "", []
+        cur = f"{cur}\n{line}" if cur else line[:MAX_LEN]
+        members.append(i)
+    out.append((cur, members))
+    return out
+
+
+def digest(lines: list[str]) -> list[str]:
+    """Join alerts into as few ≤ MAX_LEN messages as possible."""
+    return [text for text, _ in _pack(lines)]
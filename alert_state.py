@@ -0,0 +1,61 @@
+"""
+Persistent alert state (SQLite, WAL mode)
+─────────────────────────────────────────
+• One row per (symbol, rule, candle hour) with the ratio / score it fired at
+• Survives restarts, so a mid-hour restart doesn't re-send spikes
+• WAL journal → crash-safe appends that don't block readers
+• Rows older than RETENTION_DAYS are pruned, so the file stays small
+"""
+
+import sqlite3
+import threading
+import time
+
+STATE_FILE = "alert_state.db"
+RETENTION_DAYS = 7
+
+
+class AlertState:
+    """Durable record of which alerts already fired."""
+
+    def __init__(self, path: str = STATE_FILE,
+                 retention_days: float = RETENTION_DAYS):
+        self.retention_ms = int(retention_days * 86_400_000)
+        self.lock = threading.Lock()
+        self.db = sqlite3.connect(path, check_same_thread=False)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self.db.execute("""
+            CREATE TABLE IF NOT EXISTS alerts (
+                symbol TEXT    NOT NULL,
+                rule   TEXT    NOT NULL,
+                hour   INTEGER NOT NULL,     -- candle open, epoch ms
+                ratio  REAL,
+                ts     INTEGER NOT NULL,     -- when it fired, epoch ms
+                PRIMARY KEY (symbol, rule, hour)
+            ) WITHOUT ROWID""")
+        self.db.execute("CREATE INDEX IF NOT EXISTS alerts_hour ON alerts (hour)")
+        self.db.commit()
+
+    def record(self, sym: str, hour: int, rule: str, ratio: float) -> None:
+        with self.lock:
+            self.db.execute(
+                "INSERT OR IGNORE INTO alerts VALUES (?, ?, ?, ?, ?)",
+                (sym, rule, int(hour), float(ratio), int(time.time() * 1000)))
+            self.db.commit()
+
+    def latest(self) -> dict[tuple[str, str], int]:
+        """(symbol, rule) → most recent alerted candle hour."""
+        with self.lock:
+            rows = self.db.execute(
+                "SELECT symbol, rule, MAX(hour) FROM alerts GROUP BY symbol, rule")
+            return {(sym, rule): hour for sym, rule, hour in rows}
+
+    def prune(self) -> int:
+        """Drop rows past the retention window; returns how many went."""
+        cutoff = int(time.time() * 1000) - self.retention_ms
+        with self.lock:
+            n = self.db.execute("DELETE FROM alerts WHERE hour < ?",
+                                (cutoff,)).rowcount
+            self.db.commit()
+        return n
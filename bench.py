@@ -0,0 +1,277 @@
+"""
+Sweep benchmarks against replay_server.py
+─────────────────────────────────────────
+• scan()               – the bot's full sweep: cold (empty kline store and
+                         symbol cache), then warm – wall time, requests, memory
+• fetch_volume_data()  – the dashboard's table build, plus its funding call
+                         (warm = served from the shared market_data cache)
+• 300 / 1,000 / 5,000 symbols by default; every size runs in a fresh
+  process, in a scratch directory, against a fresh replay server
+• The weight limiter is lifted (BINANCE_WEIGHT_LIMIT) unless --real-weight,
+  so the numbers are the code's, not Binance's per-minute budget
+• --micro: the dashboard's table build alone, columnar vs the old row-by-row
+  version, on synthetic payloads of 1,000 / 10,000 symbols (no server)
+
+Run:  python bench.py
+      python bench.py --sizes 1000 --latency 0.05 --p429 0.01 --out bench.json
+      python bench.py --micro
+"""
+
+import argparse
+import json
+import os
+import random
+import resource
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+import urllib.request
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+TARGETS = ("scan", "dashboard")
+
+
+def requests_made() -> int:
+    import metrics
+    with metrics.binance_requests.lock:
+        return int(sum(metrics.binance_requests.values.values()))
+
+
+def timed(fn) -> tuple[float, int, object]:
+    """(seconds, Binance requests, result) of one call."""
+    n0, t0 = requests_made(), time.perf_counter()
+    out = fn()
+    return time.perf_counter() - t0, requests_made() - n0, out
+
+
+def peak_mb(fn) -> float:
+    tracemalloc.start()
+    try:
+        fn()
+        return tracemalloc.get_traced_memory()[1] / 1e6
+    finally:
+        tracemalloc.stop()
+
+# ─────────────────────── in the child process ───────────────────
+
+
+def bench_scan() -> dict:
+    import hourly_volume_alert as bot
+
+    bot.telegram.put = lambda text, done=None: None      # delivery isn't being measured
+    cold_s, cold_n, _ = timed(lambda: bot.scan(False))
+    warm_s, warm_n, _ = timed(lambda: bot.scan(False))
+    return {"cold_s": cold_s, "cold_req": cold_n,
+            "warm_s": warm_s, "warm_req": warm_n,
+            "peak_mb": peak_mb(lambda: bot.scan(False))}
+
+
+def bench_dashboard() -> dict:
+    import binance_dashboard as dash
+
+    def refresh():
+        return dash.fetch_volume_data(), dash.fetch_funding_rates()
+
+    cold_s, cold_n, (df, _) = timed(refresh)
+    warm_s, warm_n, _ = timed(refresh)
+    return {"cold_s": cold_s, "cold_req": cold_n,
+            "warm_s": warm_s, "warm_req": warm_n, "rows": len(df),
+            "peak_mb": peak_mb(refresh)}
+
+
+def child(target: str) -> None:
+    res = bench_scan() if target == "scan" else bench_dashboard()
+    res["maxrss_mb"] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print("RESULT", json.dumps(res), flush=True)
+
+# ─────────────────────── table micro-bench ──────────────────────
+
+
+def synthetic_payloads(n: int, seed: int = 1) -> tuple[list, list, set]:
+    """ticker/24hr and premiumIndex payloads for *n* perps, as Binance sends
+    them (numbers as strings), plus the active symbol set."""
+    rng = random.Random(seed)
+    tickers, premium, active = [], [], set()
+    for i in range(n):
+        sym = f"X{i:05d}" + ("USDT" if i % 10 else "USDC")
+        price = 10 ** rng.uniform(-3, 5)
+        tickers.append({"symbol": sym, "lastPrice": f"{price:.6g}",
+                        "quoteVolume": f"{10 ** rng.uniform(5, 10.5):.2f}"})
+        premium.append({"symbol": sym,
+                        "lastFundingRate": f"{rng.gauss(0, 0.0003):.8f}"})
+        if i % 7:
+            active.add(sym)
+    return tickers, premium, active
+
+
+def rowwise_table(data: list, funding: list, active_syms: set) -> list:
+    """The dashboard's table build as it was before the columnar rewrite."""
+    import pandas as pd
+    from dashboard_data import format_price, format_volume
+
+    rows = [
+        {
+            "Asset": item["symbol"].replace("USDT", ""),
+            "Volume (24h, $)": float(item["quoteVolume"]),
+            "Price (USDT)": float(item["lastPrice"]),
+        }
+        for item in data
+        if (
+            item.get("symbol", "").endswith("USDT")
+            and item["symbol"] in active_syms
+            and float(item.get("quoteVolume", 0)) > 100_000_000
+        )
+    ]
+    df = pd.DataFrame(rows).sort_values("Volume (24h, $)", ascending=False)
+    df["Volume (24h, $)"] = df["Volume (24h, $)"].apply(format_volume)
+    df["Price (USDT)"] = df["Price (USDT)"].apply(format_price)
+    df.index = range(1, len(df) + 1)
+    rates = {
+        item["symbol"].replace("USDT", ""): float(item["lastFundingRate"]) * 100
+        for item in funding
+        if item.get("symbol", "").endswith("USDT")
+    }
+    df["Funding Rate (%)"] = df["Asset"].map(rates)
+    df = df[["Asset", "Volume (24h, $)", "Funding Rate (%)", "Price (USDT)"]]
+    watchlist = [f"BINANCE:{row.Asset}USDT.P" for _, row in df.iterrows()]
+    return [df, watchlist]
+
+
+def columnar_table(data: list, funding: list, active_syms: set) -> list:
+    """The same steps through the dashboard's current helpers."""
+    import dashboard_data as dash
+
+    df = dash.dashboard_table(dash.volume_table(data, active_syms),
+                              dash.funding_table(funding))
+    watchlist = ("BINANCE:" + df["Asset"] + "USDT.P").tolist()
+    return [df, watchlist]
+
+
+def best_of(fn, repeat: int) -> float:
+    times = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - t0)
+    return min(times)
+
+
+def micro(sizes: list[int], repeat: int) -> list[dict]:
+    import pandas as pd
+
+    rows = []
+    print(f"{'symbols':>8}{'rows':>7}{'row-wise ms':>13}{'columnar ms':>13}"
+          f"{'speedup':>9}")
+    for n in sizes:
+        payloads = synthetic_payloads(n)
+        old, new = rowwise_table(*payloads), columnar_table(*payloads)
+        pd.testing.assert_frame_equal(old[0], new[0])       # same table,
+        assert old[1] == new[1]                             # same watchlist
+        t_old = best_of(lambda: rowwise_table(*payloads), repeat)
+        t_new = best_of(lambda: columnar_table(*payloads), repeat)
+        rows.append({"symbols": n, "rows": len(new[0]), "rowwise_s": t_old,
+                     "columnar_s": t_new})
+        print(f"{n:>8}{len(new[0]):>7}{t_old * 1e3:>13.2f}{t_new * 1e3:>13.2f}"
+              f"{t_old / t_new:>8.1f}x", flush=True)
+    return rows
+
+# ──────────────────────────── runner ────────────────────────────
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_server(n: int, args) -> tuple[subprocess.Popen, str]:
+    port = free_port()
+    proc = subprocess.Popen(
+        [sys.executable, os.path.join(HERE, "replay_server.py"),
+         "--port", str(port), "--symbols", str(n),
+         "--latency", str(args.latency), "--jitter", str(args.jitter),
+         "--p429", str(args.p429)],
+        stdout=subprocess.DEVNULL)
+    url = f"http://127.0.0.1:{port}"
+    for _ in range(100):
+        try:
+            urllib.request.urlopen(f"{url}/__stats", timeout=1)
+            return proc, url
+        except OSError:
+            time.sleep(0.1)
+    proc.kill()
+    raise RuntimeError("replay server did not come up")
+
+
+def run_one(target: str, n: int, args) -> dict:
+    proc, url = start_server(n, args)
+    env = dict(os.environ, BINANCE_FAPI=url, LOG_LEVEL="WARNING",
+               PYTHONPATH=os.pathsep.join(filter(None, [HERE, os.getenv("PYTHONPATH")])))
+    if not args.real_weight:
+        env["BINANCE_WEIGHT_LIMIT"] = str(10**9)
+    try:
+        with tempfile.TemporaryDirectory() as scratch:
+            out = subprocess.run([sys.executable, os.path.abspath(__file__),
+                                  "--child", target],
+                                 cwd=scratch, env=env, capture_output=True,
+                                 text=True, timeout=args.timeout)
+    finally:
+        proc.terminate()
+        proc.wait()
+    for line in out.stdout.splitlines():
+        if line.startswith("RESULT "):
+            return json.loads(line[7:])
+    raise RuntimeError(f"{target} @ {n} failed:\n{out.stderr[-2000:]}")
+
+
+def main(args) -> None:
+    sizes = [int(s) for s in args.sizes.split(",")]
+    targets = args.targets.split(",")
+    rows = []
+    print(f"{'target':<10}{'symbols':>8}{'cold s':>9}{'warm s':>9}"
+          f"{'req cold':>10}{'req warm':>10}{'peak MB':>9}{'rss MB':>8}")
+    for target in targets:
+        for n in sizes:
+            r = run_one(target, n, args)
+            rows.append(dict(r, target=target, symbols=n))
+            print(f"{target:<10}{n:>8}{r['cold_s']:>9.2f}{r['warm_s']:>9.2f}"
+                  f"{r['cold_req']:>10}{r['warm_req']:>10}"
+                  f"{r['peak_mb']:>9.1f}{r['maxrss_mb']:>8.0f}", flush=True)
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump({"args": vars(args), "results": rows}, f, indent=1)
+        print("Results written to", args.out)
+
+
+if __name__ == "__main__":
+    p = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    p.add_argument("--sizes", default="300,1000,5000")
+    p.add_argument("--targets", default=",".join(TARGETS))
+    p.add_argument("--latency", type=float, default=0.02,
+                   help="replay server latency per request, seconds")
+    p.add_argument("--jitter", type=float, default=0.01)
+    p.add_argument("--p429", type=float, default=0.0)
+    p.add_argument("--real-weight", action="store_true",
+                   help="keep the 2400/min weight limit (slow at 5,000)")
+    p.add_argument("--timeout", type=float, default=900)
+    p.add_argument("--out")
+    p.add_argument("--micro", action="store_true",
+                   help="table build micro-bench only (default sizes 1000,10000)")
+    p.add_argument("--repeat", type=int, default=20,
+                   help="--micro: best of this many runs")
+    p.add_argument("--child", choices=TARGETS, help=argparse.SUPPRESS)
+    args = p.parse_args()
+    if args.child:
+        child(args.child)
+    elif args.micro:
+        sizes = "1000,10000" if args.sizes == p.get_default("sizes") else args.sizes
+        rows = micro([int(s) for s in sizes.split(",")], args.repeat)
+        if args.out:
+            with open(args.out, "w") as f:
+                json.dump({"args": vars(args), "results": rows}, f, indent=1)
+            print("Results written to", args.out)
+    else:
+        main(args)
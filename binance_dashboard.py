@@ -3,49 +3,50 @@ Binance USDT-Perpetual Pairs Dashboard
 ──────────────────────────────────────
 • Shows 24 h volume, funding, and price
 • Auto-refreshes every 5 minutes
-• Generates a TradingView watchlist (.txt) on every hard browser reload
+• Watchlists (TradingView .txt, .txt in volume tiers, CSV, JSON) are
+  regenerated on every data refresh – written only when they changed
 • Ignores delisted / inactive contracts using /exchangeInfo status
+  (shared on-disk symbol cache, refreshed in the background)
 • NEW: watchlist lines now end with USDT.P (TradingView futures notation)
+• Fetch errors go to the structured log (jsonlog) as well as the page
+• Symbols, volume and funding come from process-wide caches shared by
+  every session and rerun (market_data.py) – one API call per TTL no
+  matter how many tabs are open; cold misses are fetched concurrently
+  and per-call timings shown in the "Debug: fetch timings" panel
+• Data, caches and table builders live in dashboard_data.py (no
+  Streamlit import); this file is only the Streamlit front end
+• Many viewers? dashboard_server.py serves the same table as cached JSON
+  (ETag / 304) with a static page – no per-viewer script reruns
+• Every perp's volume, rank, price and funding is recorded at most once
+  per refresh into snapshot_store.py; the "Trends" table draws 7-day
+  sparklines from it
 """
 
 # ──────────────────────────────────────────────────────────────
 # Imports
 # ──────────────────────────────────────────────────────────────
-import requests
+import time
+from concurrent.futures import ThreadPoolExecutor
+
 import pandas as pd
 import streamlit as st
 # pip install streamlit-autorefresh
 from streamlit_autorefresh import st_autorefresh
-from requests.adapters import HTTPAdapter
-from urllib3.util.retry import Retry
 
-# ──────────────────────────────────────────────────────────────
-# Constants & settings
-# ──────────────────────────────────────────────────────────────
-VOLUME_URL = "https://fapi.binance.com/fapi/v1/ticker/24hr"
-FUNDING_URL = "https://fapi.binance.com/fapi/v1/premiumIndex"
-EXCHANGE_INFO_URL = "https://fapi.binance.com/fapi/v1/exchangeInfo"
+import jsonlog
+from dashboard_data import (DOWNLOADS, FUNDING_COLUMNS, REFRESH_MS, TREND_DAYS,
+                            VOLUME_COLUMNS, active_symbols, dashboard_table,
+                            export_watchlists, format_table, funding_cache,
+                            funding_table, record_snapshot, trends,
+                            volume_cache, volume_frame, volume_table)
 
-REFRESH_MS = 5 * 60 * 1000      # 5 min
-WATCHLIST_FILE = "tradingview_watchlist.txt"
-CACHE_MINUTES = 60                 # refresh active-symbol cache once per hour
+log = jsonlog.setup("binance_dashboard")
 
 # ──────────────────────────────────────────────────────────────
-# Utility helpers
+# Styling
 # ──────────────────────────────────────────────────────────────
 
 
-def format_volume(volume: float) -> str:
-    volume = round(volume, -4)
-    return f"${volume / 1_000_000_000:.2f}B" if volume >= 1_000_000_000 else f"${volume / 1_000_000:.2f}M"
-
-
-def format_price(price: float | str) -> str:
-    p = float(price)
-    s = f"{p:.4f}" if p < 5 else f"{p:.2f}"
-    return f"${s.rstrip('0').rstrip('.')}"
-
-
 def get_color(rate: float) -> str:
     if rate > 0.03:
         return "background-color: #90EE90"   # light green
@@ -54,104 +55,95 @@ def get_color(rate: float) -> str:
     return ""
 
 
-# resilient requests session
-session = requests.Session()
-session.mount(
-    "https://",
-    HTTPAdapter(
-        max_retries=Retry(
-            total=3, backoff_factor=1,
-            status_forcelist=[429, 451, 500, 502, 503, 504]
-        )
-    )
-)
-
-# ──────────────────────────────────────────────────────────────
-# Active-symbol cache (no zombie contracts)
-# ──────────────────────────────────────────────────────────────
-
-
-def fetch_active_perp_syms() -> set[str]:
-    """Return USDT-quoted PERPETUAL symbols whose status is TRADING."""
-    data = session.get(EXCHANGE_INFO_URL, timeout=10).json()
-    return {
-        s["symbol"] for s in data["symbols"]
-        if s.get("contractType") == "PERPETUAL"
-        and s.get("quoteAsset") == "USDT"
-        and s.get("status") == "TRADING"
-    }
-
-
-def ensure_active_syms_cache():
-    """Populate / refresh the cached active symbol set."""
-    if "active_syms" not in st.session_state:
-        st.session_state.active_syms = fetch_active_perp_syms()
-        st.session_state.active_syms_time = pd.Timestamp.utcnow()
-    else:
-        age = (pd.Timestamp.utcnow() -
-               st.session_state.active_syms_time).total_seconds() / 60
-        if age > CACHE_MINUTES:
-            st.session_state.active_syms = fetch_active_perp_syms()
-            st.session_state.active_syms_time = pd.Timestamp.utcnow()
-
 # ──────────────────────────────────────────────────────────────
 # Data fetchers
+#   the caches are read from worker threads; the *_table() builders and
+#   every st.* call stay on the script thread
 # ──────────────────────────────────────────────────────────────
 
 
 def fetch_volume_data() -> pd.DataFrame:
     try:
-        data = session.get(VOLUME_URL, timeout=10).json()
-        rows = [
-            {
-                "Asset": item["symbol"].replace("USDT", ""),
-                "Volume (24h, $)": float(item["quoteVolume"]),
-                "Price (USDT)": float(item["lastPrice"]),
-            }
-            for item in data
-            if (
-                item.get("symbol", "").endswith("USDT")
-                and item["symbol"] in st.session_state.active_syms
-                and float(item.get("quoteVolume", 0)) > 100_000_000
-            )
-        ]
-        df = pd.DataFrame(rows).sort_values("Volume (24h, $)", ascending=False)
-        df["Volume (24h, $)"] = df["Volume (24h, $)"].apply(format_volume)
-        df["Price (USDT)"] = df["Price (USDT)"].apply(format_price)
-        df.index = range(1, len(df) + 1)
-        return df
+        return volume_table(volume_cache.get()[0], active_symbols())
     except Exception as e:
+        log.exception("Failed to fetch volume data: %s", e)
         st.error(f"Failed to fetch volume data: {e}")
-        return pd.DataFrame(columns=["Asset", "Volume (24h, $)", "Price (USDT)"])
+        return pd.DataFrame(columns=VOLUME_COLUMNS)
 
 
-def fetch_funding_rates() -> dict[str, float]:
+def fetch_funding_rates() -> pd.DataFrame:
     try:
-        data = session.get(FUNDING_URL, timeout=10).json()
-        return {
-            item["symbol"].replace("USDT", ""): float(item["lastFundingRate"]) * 100
-            for item in data
-            if item.get("symbol", "").endswith("USDT")
-        }
+        return funding_table(funding_cache.get()[0])
     except Exception as e:
+        log.exception("Failed to fetch funding: %s", e)
         st.error(f"Failed to fetch funding: {e}")
-        return {}
+        return pd.DataFrame(columns=FUNDING_COLUMNS)
 
-# ──────────────────────────────────────────────────────────────
-# Watchlist export  (UPDATED)
-# ──────────────────────────────────────────────────────────────
 
+def _timed(fn, *args):
+    """(result, error, seconds) – never raises, so it's safe in a worker."""
+    t0 = time.perf_counter()
+    try:
+        return fn(*args), None, time.perf_counter() - t0
+    except Exception as e:
+        return None, e, time.perf_counter() - t0
+
+
+def fetch_all() -> tuple[pd.DataFrame, pd.DataFrame, float, list[dict]]:
+    """Symbols, volume and funding in parallel (instant when the shared
+    caches are warm); the render waits for all three.
+    Returns (numeric volume df, funding, volume snapshot time, timings)."""
+    t0 = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=3) as pool:
+        syms = pool.submit(_timed, active_symbols)
+        vol = pool.submit(_timed, volume_cache.get)
+        fund = pool.submit(_timed, funding_cache.get)
+        calls = {"exchangeInfo (symbol cache)": syms.result(),
+                 "ticker/24hr": vol.result(),
+                 "premiumIndex": fund.result()}
+    wall = time.perf_counter() - t0
+
+    active, err, _ = calls["exchangeInfo (symbol cache)"]
+    if err is not None:
+        log.error("Failed to load active symbols: %s", err)
+        st.error(f"Failed to load active symbols: {err}")
+        active = set()
+
+    snap, err, _ = calls["ticker/24hr"]
+    as_of = snap[1] if snap else time.time()
+    try:
+        if err is not None:
+            raise err
+        vol_df = volume_frame(snap[0], active)
+        tickers = snap[0]
+    except Exception as e:
+        log.error("Failed to fetch volume data: %s", e)
+        st.error(f"Failed to fetch volume data: {e}")
+        vol_df = pd.DataFrame(columns=VOLUME_COLUMNS)
+        tickers = None
 
-def export_watchlist(df: pd.DataFrame) -> str:
-    """
-    TradingView wants Binance perpetual futures as BINANCE:<base>USDT.P
-    (e.g. BINANCE:BTCUSDT.P).  This generates one symbol per line.
-    """
-    symbols = [f"BINANCE:{row.Asset}USDT.P" for _, row in df.iterrows()]
-    txt = "\n".join(symbols)
-    with open(WATCHLIST_FILE, "w") as f:
-        f.write(txt)
-    return txt
+    snap, err, _ = calls["premiumIndex"]
+    try:
+        if err is not None:
+            raise err
+        funding = funding_table(snap[0])
+    except Exception as e:
+        log.error("Failed to fetch funding: %s", e)
+        st.error(f"Failed to fetch funding: {e}")
+        funding = pd.DataFrame(columns=FUNDING_COLUMNS)
+    if tickers is not None and active:
+        record_snapshot(tickers, snap[0] if err is None else [], active, as_of)
+
+    ages = {"ticker/24hr": volume_cache.age(), "premiumIndex": funding_cache.age()}
+    timings = [{"call": name, "seconds": round(secs, 3),
+                "status": (f"error: {err}" if err is not None else
+                           f"ok, snapshot {ages[name]:.0f}s old" if name in ages
+                           else "ok")}
+               for name, (_, err, secs) in calls.items()]
+    timings.append({"call": "wall (parallel)", "seconds": round(wall, 3),
+                    "status": f"sum of calls {sum(c[2] for c in calls.values()):.3f}s"})
+    log.debug("Dashboard fetch timings", extra={"timings": timings})
+    return vol_df, funding, as_of, timings
 
 # ──────────────────────────────────────────────────────────────
 # Dashboard
@@ -160,13 +152,12 @@ def export_watchlist(df: pd.DataFrame) -> str:
 
 def create_dashboard():
     st_autorefresh(interval=REFRESH_MS, key="auto_refresh")
-    ensure_active_syms_cache()
 
-    vol_df = fetch_volume_data()
-    funding_dict = fetch_funding_rates()
-    vol_df["Funding Rate (%)"] = vol_df["Asset"].map(funding_dict)
-    vol_df = vol_df[[
-        "Asset", "Volume (24h, $)", "Funding Rate (%)", "Price (USDT)"]]
+    vol_df, funding_df, as_of, timings = fetch_all()
+    numeric = dashboard_table(vol_df, funding_df)
+    files = export_watchlists(numeric)
+    vol_df = format_table(numeric)
+    log.debug("Dashboard refresh: %d pairs", len(vol_df))
 
     # style table
     def highlight(row):
@@ -186,19 +177,31 @@ def create_dashboard():
 
     st.title("Binance USDT-Perpetual Pairs Dashboard")
     st.write(
-        f"Data as of: {pd.Timestamp.utcnow().strftime('%Y-%m-%d %H:%M:%S UTC')}")
+        f"Data as of: {pd.Timestamp(as_of, unit='s').strftime('%Y-%m-%d %H:%M:%S UTC')}")
     st.table(styled)
 
-    # watchlist file (one-time per hard reload)
-    if "watchlist_txt" not in st.session_state:
-        st.session_state.watchlist_txt = export_watchlist(vol_df)
+    # watchlists – current on every refresh
+    for col, (label, name, mime) in zip(st.columns(len(DOWNLOADS)), DOWNLOADS):
+        col.download_button(f"Download {label}", data=files[name],
+                            file_name=name, mime=mime)
 
-    st.download_button(
-        "Download TradingView Watchlist (.txt)",
-        data=st.session_state.watchlist_txt,
-        file_name=WATCHLIST_FILE,
-        mime="text/plain",
-    )
+    st.subheader(f"Trends – last {TREND_DAYS} days (hourly)")
+    try:
+        st.dataframe(
+            trends(vol_df["Asset"]),
+            hide_index=True,
+            column_config={
+                "Volume ($M)": st.column_config.LineChartColumn("Volume ($M)"),
+                "Volume rank": st.column_config.LineChartColumn("Volume rank"),
+                "Funding (%)": st.column_config.LineChartColumn("Funding (%)"),
+            },
+        )
+    except Exception as e:
+        log.warning("Trends unavailable: %s", e)
+        st.info(f"Trends unavailable: {e}")
+
+    with st.expander("Debug: fetch timings"):
+        st.table(pd.DataFrame(timings).set_index("call"))
 
 
 # ──────────────────────────────────────────────────────────────
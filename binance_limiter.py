@@ -0,0 +1,173 @@
+"""
+Binance request-weight limiter
+──────────────────────────────
+• Token bucket sized to the futures REQUEST_WEIGHT budget (per IP, per minute)
+• Knows the weight of every endpoint the scripts call (matched on the
+  /fapi/ · /dapi/ path, so replay_server.py is paced like the real API)
+• Self-corrects from the X-MBX-USED-WEIGHT-1M response header
+• On 429 / 418 pauses *all* callers for Retry-After instead of hammering on
+
+Usage:  session = binance_session()  – limited, retrying, http + https
+        session = LimitedSession()   – bare drop-in for requests.Session()
+"""
+
+import logging
+import os
+import threading
+import time
+from urllib.parse import parse_qs, urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+import metrics
+
+log = logging.getLogger(__name__)
+
+# Binance futures REQUEST_WEIGHT per minute (override for local replays)
+WEIGHT_LIMIT_1M = int(os.getenv("BINANCE_WEIGHT_LIMIT", "2400"))
+SAFETY = 0.9                    # leave headroom for other processes on the IP
+BAN_RETRIES = 2                 # re-send after a 429 / 418 pause
+DEFAULT_RETRY_AFTER = 60        # s, when Binance omits Retry-After
+RETRY_STATUSES = (500, 502, 503, 504)
+
+# ──────────────────────── endpoint weights ──────────────────────
+
+
+def klines_weight(limit: int) -> int:
+    if limit < 100:
+        return 1
+    if limit < 500:
+        return 2
+    if limit <= 1000:
+        return 5
+    return 10
+
+
+def endpoint_weight(url: str, params: dict | None = None) -> int:
+    """Request weight of a Binance futures call; 0 for anything else."""
+    u = urlparse(url)
+    if not u.path.startswith(("/fapi/", "/dapi/")):
+        return 0
+    query = {k: v[-1] for k, v in parse_qs(u.query).items()}
+    query.update(params or {})
+    has_symbol = "symbol" in query
+    path = u.path.rsplit("/", 1)[-1]
+
+    if path in ("klines", "continuousKlines", "indexPriceKlines",
+                "markPriceKlines"):
+        return klines_weight(int(query.get("limit", 500)))
+    if path == "24hr":
+        return 1 if has_symbol else 40
+    if path == "premiumIndex":
+        return 1 if has_symbol else 10
+    if path == "exchangeInfo":
+        return 1
+    return 1
+
+# ─────────────────────────── limiter ────────────────────────────
+
+
+class WeightLimiter:
+    """Thread-safe token bucket over the per-minute request weight."""
+
+    def __init__(self, limit: int = WEIGHT_LIMIT_1M, safety: float = SAFETY):
+        self.capacity = int(limit * safety)
+        self.rate = self.capacity / 60.0          # tokens per second
+        self.tokens = float(self.capacity)
+        self.stamp = time.monotonic()
+        self.blocked_until = 0.0
+        self.used_weight = 0                      # last header value seen
+        self.lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        self.tokens = min(self.capacity,
+                          self.tokens + (now - self.stamp) * self.rate)
+        self.stamp = now
+
+    def acquire(self, weight: int) -> None:
+        """Block until *weight* tokens are available, then take them."""
+        weight = min(weight, self.capacity)
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self._refill(now)
+                if now < self.blocked_until:
+                    wait = self.blocked_until - now
+                elif self.tokens >= weight:
+                    self.tokens -= weight
+                    return
+                else:
+                    wait = (weight - self.tokens) / self.rate
+            time.sleep(wait)
+
+    def observe(self, r: requests.Response) -> None:
+        """Feed a response back: sync with the server's view of our usage."""
+        used = r.headers.get("X-MBX-USED-WEIGHT-1M")
+        with self.lock:
+            if used is not None and used.isdigit():
+                self.used_weight = int(used)
+                metrics.binance_used_weight.set(self.used_weight)
+                self._refill(time.monotonic())
+                self.tokens = min(self.tokens,
+                                  float(self.capacity - self.used_weight))
+            if r.status_code in (429, 418):
+                retry_after = r.headers.get("Retry-After", "")
+                pause = (int(retry_after) if retry_after.isdigit()
+                         else DEFAULT_RETRY_AFTER)
+                self.blocked_until = max(self.blocked_until,
+                                         time.monotonic() + pause)
+                self.tokens = 0.0
+                log.warning("Binance %s: pausing requests %ss", r.status_code, pause)
+
+
+# One bucket per process – the budget is per IP, not per session.
+LIMITER = WeightLimiter()
+
+# ─────────────────────────── session ────────────────────────────
+
+
+class LimitedSession(requests.Session):
+    """requests.Session that paces Binance calls through a WeightLimiter."""
+
+    def __init__(self, limiter: WeightLimiter = LIMITER):
+        super().__init__()
+        self.limiter = limiter
+
+    def request(self, method, url, params=None, **kwargs):
+        weight = endpoint_weight(url, params)
+        if not weight:
+            return super().request(method, url, params=params, **kwargs)
+        endpoint = urlparse(url).path.rsplit("/", 1)[-1]
+        for _ in range(BAN_RETRIES + 1):
+            self.limiter.acquire(weight)
+            t0 = time.perf_counter()
+            try:
+                r = super().request(method, url, params=params, **kwargs)
+            except Exception:
+                metrics.binance_requests.inc(endpoint=endpoint, status="error")
+                raise
+            metrics.binance_latency.observe(time.perf_counter() - t0,
+                                            endpoint=endpoint)
+            metrics.binance_requests.inc(endpoint=endpoint, status=r.status_code)
+            self.limiter.observe(r)
+            if r.status_code not in (429, 418):
+                break
+        return r
+
+
+def binance_session(pool_maxsize: int = 10,
+                    status_forcelist=RETRY_STATUSES) -> LimitedSession:
+    """LimitedSession with transport retries on 5xx, mounted for https and
+    http (BINANCE_FAPI=http://… replays).  429 / 418 are left to the
+    limiter – urllib3 would otherwise retry a 429 carrying Retry-After
+    by itself and the limiter would never see it."""
+    session = LimitedSession()
+    adapter = HTTPAdapter(pool_maxsize=pool_maxsize,
+                          max_retries=Retry(total=3, backoff_factor=1,
+                                            status_forcelist=list(status_forcelist),
+                                            respect_retry_after_header=False))
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
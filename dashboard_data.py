@@ -0,0 +1,228 @@
+"""
+Dashboard data – shared by both front ends
+──────────────────────────────────────────
+• Everything binance_dashboard.py (Streamlit) and dashboard_server.py
+  (Flask JSON API) have in common, with no Streamlit import – the
+  server runs without the Streamlit runtime installed
+• Process-wide caches: symbol universe (symbol_cache.py), volume and
+  funding snapshots (market_data.py), snapshot history (snapshot_store.py)
+• Columnar table builders: numeric volume table, funding join, display
+  formatting, snapshot recording, trend series, watchlist export
+"""
+
+# ──────────────────────────────────────────────────────────────
+# Imports
+# ──────────────────────────────────────────────────────────────
+import logging
+import os
+
+import numpy as np
+import pandas as pd
+
+import market_data
+import snapshot_store
+import symbol_cache
+import watchlist
+from binance_limiter import RETRY_STATUSES, binance_session
+
+# ──────────────────────────────────────────────────────────────
+# Constants & settings
+# ──────────────────────────────────────────────────────────────
+API = os.getenv("BINANCE_FAPI", "https://fapi.binance.com")
+VOLUME_URL = f"{API}/fapi/v1/ticker/24hr"
+FUNDING_URL = f"{API}/fapi/v1/premiumIndex"
+EXCHANGE_INFO_URL = f"{API}/fapi/v1/exchangeInfo"
+
+REFRESH_MS = 5 * 60 * 1000      # 5 min
+WATCHLIST_FILE = watchlist.TXT_FILE
+CACHE_MINUTES = 60                 # refresh active-symbol cache once per hour
+MARKET_TTL = 60                    # s, volume / funding snapshot lifetime
+TREND_DAYS = 7                     # sparkline window
+
+log = logging.getLogger(__name__)
+
+# ──────────────────────────────────────────────────────────────
+# Utility helpers
+# ──────────────────────────────────────────────────────────────
+
+
+def format_volume(volume: float) -> str:
+    volume = round(volume, -4)
+    return f"${volume / 1_000_000_000:.2f}B" if volume >= 1_000_000_000 else f"${volume / 1_000_000:.2f}M"
+
+
+def format_price(price: float | str) -> str:
+    p = float(price)
+    s = f"{p:.4f}" if p < 5 else f"{p:.2f}"
+    return f"${s.rstrip('0').rstrip('.')}"
+
+
+def format_volumes(volume: pd.Series) -> pd.Series:
+    """format_volume() over a whole column at once."""
+    v = np.round(volume.to_numpy(dtype=float), -4)
+    billions = v >= 1_000_000_000
+    num = np.char.mod("%.2f", np.where(billions, v / 1_000_000_000, v / 1_000_000))
+    unit = np.where(billions, "B", "M")
+    return "$" + pd.Series(num, index=volume.index) + unit
+
+
+def format_prices(price: pd.Series) -> pd.Series:
+    """format_price() over a whole column at once."""
+    p = price.to_numpy(dtype=float)
+    s = np.where(p < 5, np.char.mod("%.4f", p), np.char.mod("%.2f", p))
+    return "$" + pd.Series(s, index=price.index).str.rstrip("0").str.rstrip(".")
+
+
+# resilient requests session (429 / 418 handled by the weight limiter)
+session = binance_session(status_forcelist=(451, *RETRY_STATUSES))
+
+# ──────────────────────────────────────────────────────────────
+# Active-symbol cache (no zombie contracts)
+# ──────────────────────────────────────────────────────────────
+
+
+def symbol_universe() -> symbol_cache.SymbolUniverse:
+    return symbol_cache.shared(session, EXCHANGE_INFO_URL,
+                               ttl=CACHE_MINUTES * 60)
+
+
+def active_symbols() -> set[str]:
+    """Process-wide active symbol set – thread-safe, no Streamlit calls."""
+    return set(symbol_universe().get())
+
+# ──────────────────────────────────────────────────────────────
+# Market data & table builders
+#   thread-safe, no Streamlit calls – fine from worker threads
+# ──────────────────────────────────────────────────────────────
+
+VOLUME_COLUMNS = ["Asset", "Volume (24h, $)", "Price (USDT)"]
+FUNDING_COLUMNS = ["Asset", "Funding Rate (%)"]
+
+# shared across sessions: market_data keeps one instance per URL
+volume_cache = market_data.shared(session, VOLUME_URL, MARKET_TTL)
+funding_cache = market_data.shared(session, FUNDING_URL, MARKET_TTL)
+history = snapshot_store.shared()
+
+
+def volume_frame(data: list, active_syms: set[str]) -> pd.DataFrame:
+    """ticker/24hr payload → numeric table, ≥ $100 M, largest first."""
+    raw = pd.DataFrame.from_records(
+        data, columns=["symbol", "quoteVolume", "lastPrice"])
+    sym = raw["symbol"].astype(str)
+    vol = pd.to_numeric(raw["quoteVolume"], errors="coerce")
+    # isin() on an object view: pandas' string dtype hashes far slower
+    keep = (sym.str.endswith("USDT").fillna(False)
+            & sym.astype(object).isin(active_syms) & (vol > 100_000_000))
+    df = pd.DataFrame({
+        "Asset": sym[keep].str.replace("USDT", "", regex=False),
+        "Volume (24h, $)": vol[keep],
+        "Price (USDT)": pd.to_numeric(raw["lastPrice"][keep]),
+    }).sort_values("Volume (24h, $)", ascending=False)
+    df.index = range(1, len(df) + 1)
+    return df
+
+
+def format_table(df: pd.DataFrame) -> pd.DataFrame:
+    """Volume and price columns as display strings."""
+    df = df.copy()
+    df["Volume (24h, $)"] = format_volumes(df["Volume (24h, $)"])
+    df["Price (USDT)"] = format_prices(df["Price (USDT)"])
+    return df
+
+
+def volume_table(data: list, active_syms: set[str]) -> pd.DataFrame:
+    """ticker/24hr payload → formatted table, ≥ $100 M, largest first."""
+    return format_table(volume_frame(data, active_syms))
+
+
+def funding_table(data: list) -> pd.DataFrame:
+    """premiumIndex payload → Asset, funding rate in %."""
+    raw = pd.DataFrame.from_records(data, columns=["symbol", "lastFundingRate"])
+    sym = raw["symbol"].astype(str)
+    usdt = sym.str.endswith("USDT").fillna(False)
+    df = pd.DataFrame({
+        "Asset": sym[usdt].str.replace("USDT", "", regex=False),
+        "Funding Rate (%)": pd.to_numeric(raw["lastFundingRate"][usdt]) * 100,
+    })
+    return df.drop_duplicates("Asset", keep="last")
+
+
+def dashboard_table(vol_df: pd.DataFrame, funding_df: pd.DataFrame) -> pd.DataFrame:
+    """Volume table with the funding column joined in, ranks kept."""
+    index = vol_df.index
+    df = vol_df.merge(funding_df, on="Asset", how="left")[[
+        "Asset", "Volume (24h, $)", "Funding Rate (%)", "Price (USDT)"]]
+    df.index = index
+    return df
+
+
+def snapshot_frame(tickers: list, funding: list,
+                   active_syms: set[str]) -> pd.DataFrame:
+    """Every active perp's row for the snapshot store (unformatted)."""
+    raw = pd.DataFrame.from_records(
+        tickers, columns=["symbol", "quoteVolume", "lastPrice"])
+    raw = raw[raw["symbol"].astype(object).isin(active_syms)]
+    df = pd.DataFrame({"symbol": raw["symbol"].astype(object),
+                       "vol": pd.to_numeric(raw["quoteVolume"], errors="coerce"),
+                       "price": pd.to_numeric(raw["lastPrice"], errors="coerce")})
+    rates = pd.DataFrame.from_records(
+        funding, columns=["symbol", "lastFundingRate"]
+    ).drop_duplicates("symbol", keep="last")
+    pct = pd.Series(pd.to_numeric(rates["lastFundingRate"]).to_numpy() * 100,
+                    index=rates["symbol"].astype(object))
+    df["funding"] = df["symbol"].map(pct)
+    df["rank"] = df["vol"].rank(ascending=False, method="first").fillna(0)
+    return df
+
+
+def record_snapshot(tickers: list, funding: list, active_syms: set[str],
+                    as_of: float) -> None:
+    """Append the snapshot to the history store, at most once per refresh."""
+    try:
+        if history.append(int(as_of * 1000),
+                          snapshot_frame(tickers, funding, active_syms),
+                          min_interval_ms=REFRESH_MS):
+            log.debug("Snapshot recorded", extra={"as_of": as_of})
+    except Exception as e:
+        log.warning("Snapshot not recorded: %s", e)
+
+
+def trends(assets: pd.Series, days: float = TREND_DAYS) -> pd.DataFrame:
+    """Hourly volume / rank / funding series per asset, for sparklines."""
+    hist = history.query(days, (assets + "USDT").tolist())
+    hourly = hist.groupby(["symbol", hist["time"].dt.floor("h")]).last()
+    series = hourly.groupby(level="symbol").agg(list)
+    keys = assets + "USDT"
+    out = pd.DataFrame({"Asset": assets})
+    for col, name, scale in (("vol", "Volume ($M)", 1e-6),
+                             ("rank", "Volume rank", 1),
+                             ("funding", "Funding (%)", 1)):
+        got = keys.map(series[col]) if col in series else pd.Series(index=keys.index)
+        out[name] = [[round(v * scale, 4) for v in s] if isinstance(s, list) else []
+                     for s in got]
+    return out
+
+
+# ──────────────────────────────────────────────────────────────
+# Watchlist export
+# ──────────────────────────────────────────────────────────────
+
+DOWNLOADS = [  # (label, file name, mime)
+    ("TradingView Watchlist (.txt)", watchlist.TXT_FILE, "text/plain"),
+    ("TradingView, by volume tier (.txt)", watchlist.TIERS_FILE, "text/plain"),
+    ("CSV", watchlist.CSV_FILE, "text/csv"),
+    ("JSON", watchlist.JSON_FILE, "application/json"),
+]
+
+
+def export_watchlists(df: pd.DataFrame) -> dict[str, str]:
+    """
+    TradingView wants Binance perpetual futures as BINANCE:<base>USDT.P
+    (e.g. BINANCE:BTCUSDT.P).  Renders every format from the numeric
+    table (see watchlist.py) and rewrites the files that changed; an
+    empty table (fetch failed) leaves the last good files alone.
+    """
+    files = watchlist.render(df)
+    if len(df):
+        watchlist.write(files)
+    return files
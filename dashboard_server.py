@@ -0,0 +1,145 @@
+"""
+Volume / funding table as a JSON API + static page
+──────────────────────────────────────────────────
+• The table binance_dashboard.py shows, without the Streamlit runtime
+  (dashboard_data.py only): no per-viewer script rerun, Styler or HTML
+  table
+• Built once per market snapshot (volume, funding, symbol universe) –
+  the same process-wide caches the Streamlit app uses – then served as
+  pre-encoded bytes to every viewer
+• GET /api/table      → {as_of, columns, rows}; ETag / If-None-Match → 304
+• GET /watchlist.txt  → TradingView watchlist for the current table;
+  /watchlist/<file> for the other formats (watchlist.py)
+• GET /api/history?symbol=BTC&days=7 → that perp's recorded snapshots
+  (snapshot_store.py – each new snapshot is appended there too)
+• GET /               → static/dashboard.html, renders the JSON in the browser
+
+Run:  python dashboard_server.py --port 5003
+"""
+
+import argparse
+import hashlib
+import json
+import threading
+
+import pandas as pd
+from flask import Flask, Response, jsonify, request
+
+import dashboard_data as dash
+import jsonlog
+
+log = jsonlog.setup("dashboard_server")
+
+app = Flask(__name__)
+
+
+class Snapshot:
+    """One encoded table: JSON body, its ETag and the watchlist files."""
+
+    def __init__(self, numeric: pd.DataFrame, as_of: float):
+        self.files = dash.export_watchlists(numeric)
+        df = dash.format_table(numeric)
+        rows = df.astype(object).where(df.notna(), None).values.tolist()
+        self.as_of = as_of
+        self.body = json.dumps({"as_of": as_of, "columns": list(df.columns),
+                                "rows": rows}, separators=(",", ":")).encode()
+        self.etag = hashlib.sha1(self.body).hexdigest()
+
+
+class TableCache:
+    """Rebuild the table only when one of its inputs has a new snapshot."""
+
+    def __init__(self):
+        self.key: tuple | None = None
+        self.snap: Snapshot | None = None
+        self.lock = threading.Lock()
+
+    def get(self) -> Snapshot:
+        universe = dash.symbol_universe()
+        active = universe.get()
+        volume, vol_at = dash.volume_cache.get()         # raises on a cold miss
+        try:
+            funding, fund_at = dash.funding_cache.get()
+        except Exception as e:
+            log.warning("Funding unavailable, serving the table without it: %s", e)
+            funding, fund_at = [], 0.0
+        key = (vol_at, fund_at, universe.fetched_at)
+        with self.lock:                                  # one build per snapshot
+            if key != self.key:
+                active = set(active)
+                df = dash.dashboard_table(
+                    dash.volume_frame(volume, active),
+                    dash.funding_table(funding))
+                dash.record_snapshot(volume, funding, active, vol_at)
+                self.snap, self.key = Snapshot(df, vol_at), key
+                log.info("Table rebuilt", extra={"rows": len(df),
+                                                 "bytes": len(self.snap.body)})
+            return self.snap
+
+
+table = TableCache()
+
+
+def _snapshot() -> Snapshot | None:
+    try:
+        return table.get()
+    except Exception as e:
+        log.exception("Market data unavailable: %s", e)
+        return None
+
+
+def _conditional(snap: Snapshot, body: bytes, mimetype: str) -> Response:
+    resp = Response(body, mimetype=mimetype)
+    resp.set_etag(snap.etag)
+    resp.last_modified = snap.as_of
+    resp.cache_control.no_cache = True              # always revalidate → 304
+    return resp.make_conditional(request)
+
+
+@app.route("/")
+def index():
+    return app.send_static_file("dashboard.html")
+
+
+@app.route("/api/table")
+def api_table():
+    snap = _snapshot()
+    if snap is None:
+        return jsonify(error="market data unavailable"), 503
+    return _conditional(snap, snap.body, "application/json")
+
+
+@app.route("/watchlist.txt", defaults={"name": dash.WATCHLIST_FILE})
+@app.route("/watchlist/<name>")
+def watchlist(name: str):
+    mimes = {file: mime for _, file, mime in dash.DOWNLOADS}
+    if name not in mimes:
+        return jsonify(error=f"no watchlist {name}", have=list(mimes)), 404
+    snap = _snapshot()
+    if snap is None:
+        return jsonify(error="market data unavailable"), 503
+    resp = _conditional(snap, snap.files[name].encode(), mimes[name])
+    resp.headers["Content-Disposition"] = f"attachment; filename={name}"
+    return resp
+
+
+@app.route("/api/history")
+def api_history():
+    sym = request.args.get("symbol", "").upper()
+    if not sym:
+        return jsonify(error="symbol required"), 400
+    days = min(request.args.get("days", dash.TREND_DAYS, type=float), 366)
+    hist = dash.history.history(sym if sym.endswith("USDT") else f"{sym}USDT", days)
+    values = hist.astype(float).round(6).astype(object).where(hist.notna(), None)
+    ms = (hist.index - pd.Timestamp(0)) // pd.Timedelta(milliseconds=1)
+    return jsonify(symbol=sym, days=days, time=ms.tolist(),
+                   **{c: values[c].tolist() for c in values})
+
+
+if __name__ == "__main__":
+    p = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    p.add_argument("--host", default="127.0.0.1")
+    p.add_argument("--port", type=int, default=5003)
+    args = p.parse_args()
+    log.info("Serving the dashboard on http://%s:%s", args.host, args.port)
+    app.run(host=args.host, port=args.port, threaded=True)
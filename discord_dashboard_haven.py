@@ -8,6 +8,11 @@ from collections import deque
 from dateutil.parser import parse as dateutil_parse
 import socket
 import os
+
+import jsonlog
+
+log = jsonlog.setup("discord_dashboard_haven")
+
 DISCORD_TOKEN = os.getenv("DISCORD_TOKEN")
 
 # Flask app setup
@@ -85,7 +90,7 @@ def get_channel_name(channel_id):
         response.raise_for_status()
         return response.json().get('name', f"Channel {channel_id}")
     except requests.exceptions.RequestException as e:
-        print(f"Error fetching channel name for ID {channel_id}: {e}")
+        log.warning("Error fetching channel name for ID %s: %s", channel_id, e)
         return f"Channel {channel_id}"
 
 
@@ -129,7 +134,7 @@ CHANNELS = [
     {"id": "1327413038734905354", "name": get_channel_name(
         "1327413038734905354")}  # spot-crypto-2025
 ]
-print("Initialized Channels:", {ch["id"]: ch["name"] for ch in CHANNELS})
+log.info("Initialized Channels: %s", {ch["id"]: ch["name"] for ch in CHANNELS})
 
 # Parse timestamp with timezone awareness
 
@@ -147,7 +152,7 @@ def parse_timestamp(timestamp_str):
 
 def send_to_telegram(message):
     if TELEGRAM_ENABLED == 0:
-        print("Telegram functionality is disabled.")
+        log.info("Telegram functionality is disabled.")
         return
     local_tz = datetime.now().astimezone().tzinfo
     utc_time = parse_timestamp(message['timestamp'])
@@ -164,16 +169,17 @@ def send_to_telegram(message):
             timeout=10
         )
         response.raise_for_status()
-        print(f"Sent to Telegram: {telegram_message[:50]}...")
+        log.info("Sent to Telegram: %s...", telegram_message[:50],
+                 extra={"msg_id": message["id"], "channel": message["channel"]})
     except requests.exceptions.RequestException as e:
         if response and response.status_code == 429:
             retry_after = response.json().get('parameters', {}).get('retry_after', 5)
-            print(
-                f"Telegram rate limited. Retrying after {retry_after} seconds...")
+            log.warning("Telegram rate limited. Retrying after %s seconds...",
+                        retry_after)
             time.sleep(retry_after)
             send_to_telegram(message)  # Retry once
         else:
-            print(f"Error sending to Telegram: {e}")
+            log.error("Error sending to Telegram: %s", e)
     time.sleep(1)  # Slow sending to 1 message per second
 
 # Fetch messages from all channels in a single thread with 24-hour filter
@@ -195,12 +201,12 @@ def fetch_all_channels():
             try:
                 url = CHANNEL_URL_TEMPLATE.format(channel_id=channel_id) if last_message_ids[channel_id] is None else \
                     f"{CHANNEL_URL_TEMPLATE.format(channel_id=channel_id)}&after={last_message_ids[channel_id]}"
-                print(f"Fetching messages from {channel_name} with URL: {url}")
+                log.debug("Fetching messages from %s with URL: %s", channel_name, url)
                 response = requests.get(url, headers=HEADERS)
                 response.raise_for_status()
                 new_messages = response.json()
-                print(
-                    f"Fetched {len(new_messages)} messages from {channel_name}")
+                log.debug("Fetched %d messages from %s",
+                          len(new_messages), channel_name)
 
                 if new_messages:
                     valid_messages = []
@@ -210,8 +216,8 @@ def fetch_all_channels():
                         msg_timestamp = parse_timestamp(
                             msg.get('timestamp', ''))
                         local_msg_time = msg_timestamp.astimezone(local_tz)
-                        print(
-                            f"Processing message from {channel_name} by {username} at {local_msg_time}")
+                        log.debug("Processing message from %s by %s at %s",
+                                  channel_name, username, local_msg_time)
 
                         # Filter: Only include messages from ALLOWED_USERS within the last 24 hours
                         if username in ALLOWED_USERS and local_msg_time >= twenty_four_hours_ago:
@@ -230,11 +236,12 @@ def fetch_all_channels():
                                 "channel": channel_name
                             }
                             valid_messages.append(message_data)
-                            print(
-                                f"Valid message from {channel_name}: {username} - {message_data['content'][:20]}... at {local_msg_time}")
+                            log.debug("Valid message from %s: %s - %s... at %s",
+                                      channel_name, username,
+                                      message_data['content'][:20], local_msg_time)
                         else:
-                            print(
-                                f"Discarded message from {channel_name} by {username}: Outside 24h or not allowed")
+                            log.debug("Discarded message from %s by %s: Outside 24h or not allowed",
+                                      channel_name, username)
 
                     with messages_lock:
                         for msg in valid_messages:
@@ -242,8 +249,9 @@ def fetch_all_channels():
                                 messages.append(msg)
                                 if last_message_ids[channel_id] is None:  # Initial fetch
                                     initial_message_ids.add(msg['id'])
-                                print(
-                                    f"Added to deque from {channel_name}: {msg['username']} - {msg['content'][:20]}... at {msg['timestamp']}")
+                                log.debug("Added to deque from %s: %s - %s... at %s",
+                                          channel_name, msg['username'],
+                                          msg['content'][:20], msg['timestamp'])
 
                     last_message_ids[channel_id] = new_messages[0]['id']
                     # Track initial fetch completion
@@ -251,19 +259,19 @@ def fetch_all_channels():
                         initial_channels_processed += 1
                         if initial_channels_processed >= len(CHANNELS) and not initial_fetch_complete:
                             initial_fetch_complete = True
-                            print(
+                            log.info(
                                 "Initial fetch complete across all channels; Telegram sending enabled for new messages.")
                 else:
-                    print(f"No new messages from {channel_name}")
+                    log.debug("No new messages from %s", channel_name)
                     # Handle case where a channel has no messages initially
                     if last_message_ids[channel_id] is None:
                         initial_channels_processed += 1
                         if initial_channels_processed >= len(CHANNELS) and not initial_fetch_complete:
                             initial_fetch_complete = True
-                            print(
+                            log.info(
                                 "Initial fetch complete (no messages in some channels); Telegram sending enabled for new messages.")
             except requests.exceptions.RequestException as e:
-                print(f"Error fetching messages from {channel_name}: {e}")
+                log.error("Error fetching messages from %s: %s", channel_name, e)
         time.sleep(5)  # Poll every 5 seconds for all channels
 
 # Centralized Telegram sender with 24-hour filter and initial skip
@@ -271,7 +279,7 @@ def fetch_all_channels():
 
 def telegram_sender():
     if TELEGRAM_ENABLED == 0:
-        print("Telegram sender thread disabled.")
+        log.info("Telegram sender thread disabled.")
         while True:
             # Sleep for an hour if disabled to reduce resource usage
             time.sleep(3600)
@@ -300,7 +308,7 @@ def telegram_sender():
 
 @app.route('/')
 def index():
-    print("Serving index.html")
+    log.debug("Serving index.html")
     return render_template('index.html')
 
 
@@ -317,7 +325,7 @@ def get_messages():
             utc_time = parse_timestamp(msg['timestamp'])
             msg['timestamp'] = utc_time.astimezone(
                 local_tz).strftime('%Y-%m-%d %H:%M:%S')
-        print(f"Serving {len(sorted_messages)} messages to dashboard")
+        log.debug("Serving %d messages to dashboard", len(sorted_messages))
         return jsonify(sorted_messages)
 
 
@@ -330,11 +338,11 @@ telegram_thread.start()
 
 if __name__ == "__main__":
     port = 5001
-    print(f"Starting Flask server on http://127.0.0.1:{port}")
+    log.info("Starting Flask server on http://127.0.0.1:%s", port)
     # Check if port is available
     with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
         if s.connect_ex(('127.0.0.1', port)) == 0:
-            print(
-                f"Port {port} is already in use. Please free it or use a different port.")
+            log.error(
+                "Port %s is already in use. Please free it or use a different port.", port)
             exit(1)
     app.run(debug=True, use_reloader=False, port=port)
@@ -0,0 +1,294 @@
+"""
+Exchange adapters for the volume scanner
+────────────────────────────────────────
+• One interface per venue: active perpetuals, 24 h quote volume (for the
+  prefilter) and klines – all normalised to USD notional
+• Candles come back as (open_ms, close_ms, quote_vol), oldest first
+• Symbols are keyed "<venue>:<symbol>"; Binance USDT-M keeps bare symbols
+  so stored candles and alert state from before carry over
+• Parsing is split from fetching, so the adapters run offline against
+  fixtures/ – responses hand-built from each venue's documented schema,
+  not recorded traffic:  python exchanges.py --check fixtures, and
+  test_exchanges.py
+
+  binance  Binance USDT-M   /fapi    quote volume = kline[7]
+  coinm    Binance COIN-M   /dapi    contracts × contract size (USD)
+  bybit    Bybit v5 linear  /v5      turnover
+"""
+
+import argparse
+import json
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+import symbol_cache
+from multi_interval import INTERVAL_MS
+
+# base URLs – point them at replay_server.py to run without the exchanges
+FAPI = os.getenv("BINANCE_FAPI", "https://fapi.binance.com")
+DAPI = os.getenv("BINANCE_DAPI", "https://dapi.binance.com")
+BYBIT_API = os.getenv("BYBIT_API", "https://api.bybit.com")
+
+log = logging.getLogger(__name__)
+
+
+def get_json(session: requests.Session, url: str, params: dict | None = None):
+    r = session.get(url, params=params, timeout=10)
+    r.raise_for_status()
+    return r.json()
+
+
+class Exchange:
+    """A venue's perpetuals, seen through the scanner's symbol / candle model."""
+
+    name = ""
+    info_path = ""
+    klines_path = ""
+    tickers_path = ""
+
+    def __init__(self, api: str):
+        self.api = api
+
+    @property
+    def info_url(self) -> str:
+        return self.api + self.info_path
+
+    @property
+    def klines_url(self) -> str:
+        return self.api + self.klines_path
+
+    @property
+    def tickers_url(self) -> str:
+        return self.api + self.tickers_path
+
+    def key(self, sym: str) -> str:
+        return f"{self.name}:{sym}"
+
+    # ── parsing (one response payload in, normalised data out) ──
+    def parse_symbols(self, payload) -> list[str]:
+        raise NotImplementedError
+
+    def parse_volumes(self, payload) -> dict[str, float]:
+        raise NotImplementedError
+
+    def parse_klines(self, payload, sym: str, interval: str) -> list[tuple]:
+        raise NotImplementedError
+
+    # ── fetching ──
+    def fetch_symbols(self, session: requests.Session, url: str) -> list[str]:
+        return self.parse_symbols(get_json(session, url))
+
+    def symbols(self, session: requests.Session) -> list[str]:
+        universe = symbol_cache.shared(session, self.info_url,
+                                       f"{self.name}_perps_cache.json",
+                                       fetch=self.fetch_symbols)
+        return universe.get()
+
+    def volumes_24h(self, session: requests.Session) -> dict[str, float]:
+        return self.parse_volumes(get_json(session, self.tickers_url))
+
+    def klines(self, session: requests.Session, sym: str, interval: str,
+               limit: int) -> list[tuple]:
+        payload = get_json(session, self.klines_url,
+                           {"symbol": sym, "interval": interval, "limit": limit})
+        return self.parse_klines(payload, sym, interval)
+
+
+class BinanceUSDM(Exchange):
+    name = "binance"
+    info_path = "/fapi/v1/exchangeInfo"
+    klines_path = "/fapi/v1/klines"
+    tickers_path = "/fapi/v1/ticker/24hr"
+
+    def key(self, sym: str) -> str:
+        return sym
+
+    def symbols(self, session: requests.Session) -> list[str]:
+        # same cache file the dashboard shares
+        return symbol_cache.shared(session, self.info_url,
+                                   fetch=self.fetch_symbols).get()
+
+    def parse_symbols(self, payload) -> list[str]:
+        return [s["symbol"] for s in payload["symbols"]
+                if s.get("contractType") == "PERPETUAL"
+                and s.get("quoteAsset") == "USDT"
+                and s.get("status") == "TRADING"]
+
+    def parse_volumes(self, payload) -> dict[str, float]:
+        return {t["symbol"]: float(t["quoteVolume"]) for t in payload}
+
+    def parse_klines(self, payload, sym: str, interval: str) -> list[tuple]:
+        return [(k[0], k[6], float(k[7])) for k in payload]
+
+
+class BinanceCOINM(Exchange):
+    """Inverse contracts: volume is in contracts of a fixed USD face value."""
+
+    name = "coinm"
+    info_path = "/dapi/v1/exchangeInfo"
+    klines_path = "/dapi/v1/klines"
+    tickers_path = "/dapi/v1/ticker/24hr"
+
+    def __init__(self, api: str):
+        super().__init__(api)
+        self.sizes: dict[str, float] = {}
+
+    def contract_size(self, sym: str) -> float:
+        # exchangeInfo may have come from the disk cache – fall back to
+        # Binance's fixed sizes: 100 USD for BTC, 10 USD for everything else
+        return self.sizes.get(sym) or (100.0 if sym.startswith("BTCUSD") else 10.0)
+
+    def parse_symbols(self, payload) -> list[str]:
+        syms = []
+        for s in payload["symbols"]:
+            if (s.get("contractType") == "PERPETUAL"
+                    and s.get("contractStatus") == "TRADING"):
+                self.sizes[s["symbol"]] = float(s["contractSize"])
+                syms.append(s["symbol"])
+        return syms
+
+    def parse_volumes(self, payload) -> dict[str, float]:
+        return {t["symbol"]: float(t["volume"]) * self.contract_size(t["symbol"])
+                for t in payload}
+
+    def parse_klines(self, payload, sym: str, interval: str) -> list[tuple]:
+        size = self.contract_size(sym)
+        return [(k[0], k[6], float(k[5]) * size) for k in payload]
+
+
+class BybitLinear(Exchange):
+    name = "bybit"
+    info_path = "/v5/market/instruments-info"
+    klines_path = "/v5/market/kline"
+    tickers_path = "/v5/market/tickers"
+    INTERVALS = {"5m": "5", "15m": "15", "30m": "30", "1h": "60", "2h": "120",
+                 "4h": "240"}
+
+    @staticmethod
+    def _result(payload) -> dict:
+        if payload.get("retCode") != 0:
+            raise ValueError(f"Bybit error {payload.get('retCode')}: "
+                             f"{payload.get('retMsg')}")
+        return payload["result"]
+
+    def fetch_symbols(self, session: requests.Session, url: str) -> list[str]:
+        syms, cursor = [], ""
+        while True:                             # paginated, 1000 per page
+            payload = get_json(session, url, {"category": "linear",
+                                              "limit": 1000, "cursor": cursor})
+            syms += self.parse_symbols(payload)
+            cursor = self._result(payload).get("nextPageCursor")
+            if not cursor:
+                return syms
+
+    def parse_symbols(self, payload) -> list[str]:
+        return [s["symbol"] for s in self._result(payload)["list"]
+                if s.get("contractType") == "LinearPerpetual"
+                and s.get("quoteCoin") == "USDT"
+                and s.get("status") == "Trading"]
+
+    def volumes_24h(self, session: requests.Session) -> dict[str, float]:
+        return self.parse_volumes(get_json(session, self.tickers_url,
+                                           {"category": "linear"}))
+
+    def parse_volumes(self, payload) -> dict[str, float]:
+        return {t["symbol"]: float(t["turnover24h"])
+                for t in self._result(payload)["list"]}
+
+    def klines(self, session: requests.Session, sym: str, interval: str,
+               limit: int) -> list[tuple]:
+        payload = get_json(session, self.klines_url,
+                           {"category": "linear", "symbol": sym,
+                            "interval": self.INTERVALS[interval], "limit": limit})
+        return self.parse_klines(payload, sym, interval)
+
+    def parse_klines(self, payload, sym: str, interval: str) -> list[tuple]:
+        ms = INTERVAL_MS[interval]
+        # newest first: [start, open, high, low, close, volume, turnover]
+        return [(int(k[0]), int(k[0]) + ms - 1, float(k[6]))
+                for k in reversed(self._result(payload)["list"])]
+
+
+VENUES: dict[str, Exchange] = {
+    "binance": BinanceUSDM(FAPI),
+    "coinm": BinanceCOINM(DAPI),
+    "bybit": BybitLinear(BYBIT_API),
+}
+
+_by_key: dict[str, tuple[Exchange, str]] = {}
+_by_key_lock = threading.Lock()
+
+
+def parse_venues(spec: str) -> list[Exchange]:
+    """"binance,coinm,bybit" → adapters (unknown names raise ValueError)."""
+    names = [n.strip() for n in spec.split(",") if n.strip()]
+    unknown = [n for n in names if n not in VENUES]
+    if unknown:
+        raise ValueError(f"Unknown venue(s): {', '.join(unknown)} "
+                         f"(have {', '.join(VENUES)})")
+    return [VENUES[n] for n in names]
+
+
+def universe(session: requests.Session, venues: list[Exchange]) -> list[str]:
+    """Symbol keys across every venue, fetched concurrently; a venue that
+    fails is skipped for this sweep."""
+    def one(ex):
+        try:
+            return ex, ex.symbols(session)
+        except Exception as e:
+            log.warning("%s symbols unavailable this sweep: %s", ex.name, e)
+            return ex, []
+
+    keys = []
+    with ThreadPoolExecutor(max_workers=len(venues) or 1) as pool:
+        for ex, syms in pool.map(one, venues):
+            with _by_key_lock:
+                for sym in syms:
+                    _by_key[ex.key(sym)] = ex, sym
+            keys += [ex.key(s) for s in syms]
+    return keys
+
+
+def resolve(key: str) -> tuple[Exchange, str]:
+    """Symbol key → (adapter, venue symbol)."""
+    got = _by_key.get(key)
+    if got is not None:
+        return got
+    venue, sep, sym = key.partition(":")
+    if sep and venue in VENUES:
+        return VENUES[venue], sym
+    return VENUES["binance"], key
+
+# ─────────────────────── fixture check ──────────────────────────
+
+
+def check(root: str) -> None:
+    """Parse the fixture responses under *root*/<venue>/ and print them
+    normalised – a quick look at every adapter (test_exchanges.py asserts)."""
+    for name, ex in VENUES.items():
+        d = os.path.join(root, name)
+        if not os.path.isdir(d):
+            continue
+
+        def load(stem):
+            with open(os.path.join(d, f"{stem}.json")) as f:
+                return json.load(f)
+
+        syms = ex.parse_symbols(load("exchangeInfo"))
+        vols = ex.parse_volumes(load("ticker24hr"))
+        print(f"{name}: {len(syms)} symbols  {syms[:4]}")
+        for sym in syms[:2]:
+            kl = ex.parse_klines(load(f"klines_{sym}"), sym, "1h")
+            print(f"  {ex.key(sym):<22} 24h ${vols.get(sym, 0):>16,.0f}  "
+                  f"last 1h ${kl[-1][2]:>14,.0f}  ({len(kl)} candles)")
+
+
+if __name__ == "__main__":
+    p = argparse.ArgumentParser(description="Exchange adapter check")
+    p.add_argument("--check", metavar="DIR", default="fixtures",
+                   help="parse fixture responses from DIR/<venue>/")
+    check(p.parse_args().check)
@@ -8,6 +8,10 @@ from collections import deque
 from dateutil.parser import parse as dateutil_parse
 import socket
 
+import jsonlog
+
+log = jsonlog.setup("flyzoo_dashboard")
+
 # Flask app setup
 app = Flask(__name__)
 MAX_MESSAGES = 1000  # Increased for better capacity
@@ -62,7 +66,7 @@ def parse_timestamp(timestamp_str):
 # Send message to Telegram with rate limit handling and toggle
 def send_to_telegram(message):
     if TELEGRAM_ENABLED == 0:
-        print("Telegram functionality is disabled.")
+        log.info("Telegram functionality is disabled.")
         return
     local_tz = datetime.now().astimezone().tzinfo
     utc_time = parse_timestamp(message['timestamp'])
@@ -79,15 +83,16 @@ def send_to_telegram(message):
             timeout=10
         )
         response.raise_for_status()
-        print(f"Sent to Telegram: {telegram_message[:50]}...")
+        log.info("Sent to Telegram: %s...", telegram_message[:50],
+                 extra={"msg_id": message["id"]})
     except requests.exceptions.RequestException as e:
         if response and response.status_code == 429:
             retry_after = response.json().get('parameters', {}).get('retry_after', 5)
-            print(f"Telegram rate limited. Retrying after {retry_after} seconds...")
+            log.warning("Telegram rate limited. Retrying after %s seconds...", retry_after)
             time.sleep(retry_after)
             send_to_telegram(message)  # Retry once
         else:
-            print(f"Error sending to Telegram: {e}")
+            log.error("Error sending to Telegram: %s", e)
     time.sleep(1)  # Slow sending to 1 message per second
 
 # Fetch messages from Flyzoo API with 24-hour and user-specific flag filter
@@ -106,7 +111,7 @@ def fetch_messages():
                 "q": 25,
                 "wid": WEBSITE_ID
             }
-            print(f"Fetching messages from Flyzoo with URL: {API_URL} and params: {params}")
+            log.debug("Fetching messages from Flyzoo with URL: %s and params: %s", API_URL, params)
             response = requests.get(API_URL, headers=HEADERS, params=params)
             response.raise_for_status()
             data = response.json()
@@ -114,7 +119,7 @@ def fetch_messages():
             if not isinstance(messages_data, list):
                 # Handle stringified JSON if needed
                 messages_data = eval(messages_data)
-            print(f"Fetched {len(messages_data)} messages from Flyzoo")
+            log.debug("Fetched %d messages from Flyzoo", len(messages_data))
 
             if messages_data:
                 valid_messages = []
@@ -122,7 +127,7 @@ def fetch_messages():
                     username = msg.get('UserName', 'Unknown')
                     msg_timestamp = parse_timestamp(msg.get('Date', ''))
                     local_msg_time = msg_timestamp.astimezone(local_tz)
-                    print(f"Processing message from Flyzoo by {username} at {local_msg_time}")
+                    log.debug("Processing message from Flyzoo by %s at %s", username, local_msg_time)
 
                     # Filter: Include messages from allowed users within the last 24 hours
                     content = msg.get('Text', '')
@@ -130,7 +135,7 @@ def fetch_messages():
                         user_config = ALLOWED_USERS[username]
                         # Apply flag filter for smartertrader, but not for GeoTrader
                         if user_config["requires_flag"] and "🚩" not in content:
-                            print(f"Discarded message from Flyzoo by {username}: No 🚩 emoji")
+                            log.debug("Discarded message from Flyzoo by %s: No 🚩 emoji", username)
                             continue
                         message_data = {
                             "id": msg.get('Id'),
@@ -143,9 +148,9 @@ def fetch_messages():
                             "channel": "flyzoo-chat"  # Single "channel" name for consistency
                         }
                         valid_messages.append(message_data)
-                        print(f"Valid message from Flyzoo: {username} - {message_data['content'][:20]}... at {local_msg_time}")
+                        log.debug("Valid message from Flyzoo: %s - %s... at %s", username, message_data['content'][:20], local_msg_time)
                     else:
-                        print(f"Discarded message from Flyzoo by {username}: Not an allowed user or outside 24h")
+                        log.debug("Discarded message from Flyzoo by %s: Not an allowed user or outside 24h", username)
 
                 with messages_lock:
                     for msg in valid_messages:
@@ -153,7 +158,7 @@ def fetch_messages():
                             messages.append(msg)
                             if not initial_fetch_done:  # Initial fetch
                                 initial_message_ids.add(msg['id'])
-                            print(f"Added to deque from Flyzoo: {msg['username']} - {msg['content'][:20]}... at {msg['timestamp']}")
+                            log.debug("Added to deque from Flyzoo: %s - %s... at %s", msg['username'], msg['content'][:20], msg['timestamp'])
 
                 # Update last_timestamp for pagination (use the oldest message’s timestamp)
                 last_timestamp = parse_timestamp(messages_data[-1]['Date']) if messages_data else None
@@ -162,23 +167,23 @@ def fetch_messages():
                     initial_fetch_done = True
                     if not initial_fetch_complete:
                         initial_fetch_complete = True
-                        print("Initial fetch complete from Flyzoo; Telegram sending enabled for new messages.")
+                        log.info("Initial fetch complete from Flyzoo; Telegram sending enabled for new messages.")
             else:
-                print(f"No new messages from Flyzoo")
+                log.debug("No new messages from Flyzoo")
                 # Set initial fetch complete if no messages are fetched initially
                 if not initial_fetch_done and not initial_fetch_complete:
                     initial_fetch_complete = True
-                    print("Initial fetch complete (no messages from Flyzoo); Telegram sending enabled for new messages.")
+                    log.info("Initial fetch complete (no messages from Flyzoo); Telegram sending enabled for new messages.")
         except requests.exceptions.RequestException as e:
-            print(f"Error fetching messages from Flyzoo: {e}")
+            log.error("Error fetching messages from Flyzoo: %s", e)
         except (ValueError, SyntaxError) as e:
-            print(f"Error parsing Flyzoo response: {e}")
+            log.error("Error parsing Flyzoo response: %s", e)
         time.sleep(5)  # Poll every 5 seconds
 
 # Centralized Telegram sender with 24-hour and user-specific flag filter
 def telegram_sender():
     if TELEGRAM_ENABLED == 0:
-        print("Telegram sender thread disabled.")
+        log.info("Telegram sender thread disabled.")
         while True:
             time.sleep(3600)  # Sleep for an hour if disabled to reduce resource usage
         return
@@ -207,7 +212,7 @@ def telegram_sender():
 # Flask routes
 @app.route('/')
 def index():
-    print("Serving index.html")
+    log.debug("Serving index.html")
     return render_template('index.html')
 
 @app.route('/messages')
@@ -221,7 +226,7 @@ def get_messages():
         for msg in sorted_messages:
             utc_time = parse_timestamp(msg['timestamp'])
             msg['timestamp'] = utc_time.astimezone(local_tz).strftime('%Y-%m-%d %H:%M:%S')
-        print(f"Serving {len(sorted_messages)} messages to dashboard")
+        log.debug("Serving %d messages to dashboard", len(sorted_messages))
         return jsonify(sorted_messages)
 
 # Start message fetching and Telegram sender threads
@@ -233,10 +238,10 @@ telegram_thread.start()
 
 if __name__ == "__main__":
     port = 5003
-    print(f"Starting Flask server on http://127.0.0.1:{port}")
+    log.info("Starting Flask server on http://127.0.0.1:%s", port)
     # Check if port is available
     with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
         if s.connect_ex(('127.0.0.1', port)) == 0:
-            print(f"Port {port} is already in use. Please free it or use a different port.")
+            log.error("Port %s is already in use. Please free it or use a different port.", port)
             exit(1)
     app.run(debug=True, use_reloader=False, port=5003)
\ No newline at end of file
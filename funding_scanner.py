@@ -0,0 +1,279 @@
+"""
+Funding-rate anomaly scanner – Binance USDT-Perpetuals
+──────────────────────────────────────────────────────
+• Headless counterpart of the dashboard's funding column: one bulk
+  /fapi/v1/premiumIndex request per cycle (every 5 min on the clock)
+  gives every perp's funding rate, mark and index price
+• Rolling in-memory history per symbol (ring buffer, --window cycles) of
+  the funding rate and the mark / index basis
+• Each cycle, one vectorised pass over all perps and both measures:
+    abs    |funding| ≥ --funding-abs %   or   |basis| ≥ --basis-abs %
+    cross  cross-sectional z-score ≥ --z, robust (median / MAD across all
+           perps, so a few extreme symbols can't mask themselves)
+    drift  z-score against the symbol's own rolling history ≥ --z
+• z-scores use a floor on the spread – most perps sit at exactly 0.01 %,
+  and a zero MAD must not turn 0.011 % into an alert
+• Alerts go out through the Telegram digest queue (alert_queue.py), at
+  most once per symbol, rule and funding period; an alert is kept in
+  SQLite (alert_state.py) once Telegram accepted it, so restarts don't
+  re-send it – a failed send is retried on the next scan
+• --metrics-port: Prometheus /metrics (cycle time, anomalies per rule)
+
+Run:  python funding_scanner.py
+      python funding_scanner.py --once --funding-abs 0.05 --z 4
+"""
+
+import argparse
+import functools
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+import alert_queue
+import alert_state
+import exchanges
+import jsonlog
+import metrics
+import scheduler
+from binance_limiter import binance_session
+
+log = jsonlog.setup("funding_scanner")
+
+PREMIUM_URL = f"{exchanges.FAPI}/fapi/v1/premiumIndex"
+PERIOD = 300                    # s between cycles, on the clock
+WINDOW = 288                    # cycles of history per symbol (24 h at 5 min)
+MIN_HISTORY = 12                # drift rule stays quiet until this many
+FUNDING_ABS = 0.10              # %, per funding interval
+BASIS_ABS = 0.50                # %, (mark − index) / index
+Z_SCORE = 5.0
+HOUR_MS = 3_600_000
+DRAIN_TIMEOUT = 120             # s --once waits for Telegram before exiting
+
+MEASURES = ("rate", "basis")    # rule keys: funding:<measure>:<rule>
+RULES = ("abs", "cross", "drift")
+# smallest spread a z-score divides by, per measure (%)
+Z_FLOOR = np.array([[0.005], [0.02]])
+
+# Telegram
+TELEGRAM_TOKEN = os.getenv("TELEGRAM_TOKEN")
+CHAT_ID = os.getenv("CHAT_ID")
+telegram = alert_queue.TelegramQueue(TELEGRAM_TOKEN, CHAT_ID)
+
+# Alerts fired, shared with the volume bot's state file (rules "funding:…")
+state = alert_state.AlertState()
+last_fired: dict[tuple[str, str], int] = {}      # (symbol, rule) → period
+
+# Prometheus metrics (served with --metrics-port)
+cycle_seconds = metrics.Histogram("funding_cycle_seconds",
+                                  "Wall time of one funding scan")
+perps_scanned = metrics.Gauge("funding_perps_scanned",
+                              "Perps evaluated in the last funding scan")
+anomalies_total = metrics.Counter("funding_anomalies_total",
+                                  "Funding / basis anomalies fired by rule",
+                                  ("rule",))
+
+# ─────────────────────── requests session ───────────────────────
+session = binance_session()
+
+# ─────────────────────────── history ────────────────────────────
+
+
+class RollingHistory:
+    """Last *window* cycles of every measure per symbol, as one
+    (measure, symbol, slot) array – a ring over the slot axis."""
+
+    def __init__(self, window: int = WINDOW, capacity: int = 512):
+        self.window = window
+        self.index: dict[str, int] = {}
+        self.cycles = 0
+        self.data = np.full((len(MEASURES), capacity, window), np.nan)
+
+    def rows(self, syms) -> np.ndarray:
+        for s in syms:
+            if s not in self.index:
+                self.index[s] = len(self.index)
+        while len(self.index) > self.data.shape[1]:
+            grow = np.full_like(self.data, np.nan)
+            self.data = np.concatenate([self.data, grow], axis=1)
+        return np.fromiter((self.index[s] for s in syms), dtype=np.int64,
+                           count=len(syms))
+
+    def stats(self, rows: np.ndarray):
+        """(mean, std, count) of each measure's history for *rows*."""
+        hist = self.data[:, rows, :]
+        count = np.sum(~np.isnan(hist), axis=2)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            mean = np.nansum(hist, axis=2) / count
+            var = np.nansum((hist - mean[..., None]) ** 2, axis=2) / count
+        return mean, np.sqrt(var), count
+
+    def push(self, rows: np.ndarray, values: np.ndarray) -> None:
+        """Record this cycle; symbols missing from it get a gap."""
+        slot = self.cycles % self.window
+        self.data[:, :, slot] = np.nan
+        self.data[:, rows, slot] = values
+        self.cycles += 1
+
+
+history = RollingHistory()
+
+# ────────────────────────── detection ───────────────────────────
+
+
+def parse_premium(payload: list, active: set[str] | None = None):
+    """premiumIndex → (symbols, values[measure, symbol] in %, funding period)
+    for USDT perps (quarterlies like BTCUSDT_240628 are dropped)."""
+    raw = pd.DataFrame.from_records(
+        payload, columns=["symbol", "markPrice", "indexPrice",
+                          "lastFundingRate", "nextFundingTime"])
+    sym = raw["symbol"].astype(object)
+    mark = pd.to_numeric(raw["markPrice"], errors="coerce").to_numpy()
+    index = pd.to_numeric(raw["indexPrice"], errors="coerce").to_numpy()
+    keep = (sym.str.endswith("USDT").fillna(False).to_numpy()
+            & (index > 0) & ~np.isnan(mark))
+    if active is not None:
+        keep &= sym.isin(active).to_numpy()
+    funding = pd.to_numeric(raw["lastFundingRate"], errors="coerce").to_numpy() * 100
+    values = np.vstack([funding, (mark - index) / np.where(index > 0, index, 1) * 100])
+    period = pd.to_numeric(raw["nextFundingTime"], errors="coerce").fillna(0)
+    return (sym[keep].tolist(), values[:, keep],
+            period.to_numpy(dtype=np.int64)[keep])
+
+
+def detect(values: np.ndarray, mean: np.ndarray, std: np.ndarray,
+           count: np.ndarray, abs_limits: np.ndarray, z: float = Z_SCORE,
+           min_history: int = MIN_HISTORY):
+    """All rules for all measures and symbols at once.
+    Returns (hit, score), both shaped (rule, measure, symbol) in RULES order."""
+    with np.errstate(invalid="ignore"):
+        med = np.nanmedian(values, axis=1, keepdims=True)
+        mad = np.nanmedian(np.abs(values - med), axis=1, keepdims=True)
+        cross = (values - med) / np.maximum(1.4826 * mad, Z_FLOOR)
+        drift = (values - mean) / np.maximum(std, Z_FLOOR)
+    score = np.stack([values, cross, drift])
+    limits = np.stack([np.broadcast_to(abs_limits[:, None], values.shape),
+                       np.full(values.shape, z), np.full(values.shape, z)])
+    hit = np.abs(np.nan_to_num(score)) >= limits
+    hit[2] &= count >= min_history
+    return hit, score
+
+
+def describe(rule: str, measure: str, score: float) -> str:
+    measure = "funding" if measure == "rate" else measure
+    if rule == "abs":
+        return f"{measure} {score:+.4f}%"
+    what = "vs all perps" if rule == "cross" else "vs own history"
+    return f"{measure} z {score:+.1f} {what}"
+
+
+def delivered(sym: str, alerts: list[tuple], ok: bool) -> None:
+    """Telegram callback: record what went out; free what didn't, so the
+    next scan fires it again."""
+    for rule, period, score in alerts:
+        if ok:
+            state.record(sym, period, rule, score)
+        elif last_fired.get((sym, rule)) == period:
+            last_fired.pop((sym, rule), None)
+
+
+def scan(abs_limits: np.ndarray, z: float) -> None:
+    t0 = time.perf_counter()
+    try:
+        active = set(exchanges.VENUES["binance"].symbols(session))
+    except Exception as e:
+        log.warning("Active symbols unavailable, scanning all: %s", e)
+        active = None
+    r = session.get(PREMIUM_URL, timeout=10)
+    r.raise_for_status()
+    syms, values, funding_period = parse_premium(r.json(), active)
+
+    rows = history.rows(syms)
+    mean, std, count = history.stats(rows)
+    hit, score = detect(values, mean, std, count, abs_limits, z)
+    history.push(rows, values)
+
+    now_ms = int(time.time() * 1000)
+    # one dedupe key per funding period for the rate, per hour for the basis
+    periods = np.stack([funding_period, np.full(len(syms), now_ms // HOUR_MS * HOUR_MS)])
+    fired = 0
+    for i in np.flatnonzero(hit.any(axis=(0, 1))):
+        sym, reasons, alerts = syms[i], [], []
+        for ri, mi in zip(*np.nonzero(hit[:, :, i])):
+            rule = f"funding:{MEASURES[mi]}:{RULES[ri]}"
+            period = int(periods[mi, i])
+            if last_fired.get((sym, rule)) == period:
+                continue
+            last_fired[sym, rule] = period           # released if the send fails
+            anomalies_total.inc(rule=rule)
+            alerts.append((rule, period, float(score[ri, mi, i])))
+            reasons.append(describe(RULES[ri], MEASURES[mi], float(score[ri, mi, i])))
+        if not reasons:
+            continue
+        fired += 1
+        log.info("FUNDING ANOMALY %s: %s", sym, "; ".join(reasons),
+                 extra={"symbol": sym, "funding": round(float(values[0, i]), 6),
+                        "basis": round(float(values[1, i]), 6),
+                        "reasons": reasons})
+        telegram.put(f"{sym} funding {values[0, i]:+.4f}%, basis "
+                     f"{values[1, i]:+.3f}% — {'; '.join(reasons)} "
+                     f"— FUNDING ANOMALY",
+                     done=functools.partial(delivered, sym, alerts))
+    telegram.flush()
+
+    perps_scanned.set(len(syms))
+    cycle_seconds.observe(time.perf_counter() - t0)
+    log.info("Funding scan: %d perps, %d anomalies, %.2fs", len(syms), fired,
+             time.perf_counter() - t0,
+             extra={"perps": len(syms), "anomalies": fired,
+                    "history": min(history.cycles, history.window)})
+
+# ───────────────────────── main loop ────────────────────────────
+
+
+def restore_state() -> None:
+    """Reload dedupe state for the funding rules from the alert store."""
+    pruned = state.prune()
+    for (sym, rule), period in state.latest().items():
+        if rule.startswith("funding:"):
+            last_fired[sym, rule] = period
+    log.info("Alert state: %d funding entries restored, %d pruned",
+             len(last_fired), pruned)
+
+
+if __name__ == "__main__":
+    p = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    p.add_argument("--funding-abs", type=float, default=FUNDING_ABS,
+                   help="alert on |funding rate| ≥ this many %%")
+    p.add_argument("--basis-abs", type=float, default=BASIS_ABS,
+                   help="alert on |mark − index| / index ≥ this many %%")
+    p.add_argument("--z", type=float, default=Z_SCORE,
+                   help="z-score threshold, cross-sectional and own-history")
+    p.add_argument("--window", type=int, default=WINDOW,
+                   help="cycles of history per symbol")
+    p.add_argument("--period", type=int, default=PERIOD,
+                   help="seconds between scans, aligned to the clock")
+    p.add_argument("--once", action="store_true", help="one scan, then exit")
+    p.add_argument("--metrics-port", type=int,
+                   help="serve Prometheus metrics on this port")
+    args = p.parse_args()
+    history = RollingHistory(args.window)
+    limits = np.array([args.funding_abs, args.basis_abs])
+
+    if args.metrics_port:
+        metrics.serve(args.metrics_port)
+    restore_state()
+    if args.once:
+        scan(limits, args.z)
+        if not telegram.drain(DRAIN_TIMEOUT):
+            log.warning("Telegram still sending after %ss, exiting anyway",
+                        DRAIN_TIMEOUT)
+    else:
+        log.info("Funding scanner running…  (Ctrl-C to stop)")
+        for _ in scheduler.BoundaryScheduler(args.period).ticks():
+            try:
+                scan(limits, args.z)
+                state.prune()
+            except Exception as e:
+                log.exception("Funding scan failed: %s", e)
@@ -1,44 +1,114 @@
 """
-Hourly Volume Spike Alert – Binance USDT-Perpetuals
-────────────────────────────────────────────────────
-• Scans every 5 min on the clock (…:00, :05, :10, …)
+Hourly Volume Spike Alert – Binance USDT-Perpetuals (+ other venues)
+────────────────────────────────────────────────────────────────────
+• Scans every 5 min on the clock (…:00, :05, :10, …) – drift-free
+  scheduler, late / missed boundaries are reported and caught up
+• Klines for the whole universe are fetched concurrently (thread pool),
+  paced by the shared Binance request-weight limiter
+• Symbol universe comes from a TTL / on-disk exchangeInfo cache
+• --venues binance,coinm,bybit: every venue scanned in the same sweep
+  through the exchange adapters (exchanges.py), volumes in USD notional
+• Closed candles are kept in a memory-mapped store, so each sweep only
+  downloads the open candle
+• One bulk /ticker/24hr call drops symbols that can't reach $3 M in an
+  hour before any per-symbol kline request is made
 • At hh:00 → uses last two *closed* hourly candles
   All other times → compares current open candle vs. previous closed
 • Fires when curr ≥ 3× prev and ≥ $3 M notional
-• Prints one line per symbol, magenta highlight on spikes
-• Sends spikes to Telegram
+• Structured JSON log lines (jsonlog): spikes / sweep summaries at INFO,
+  the per-symbol table at DEBUG (LOG_LEVEL=DEBUG to see it)
+• Alerted (symbol, hour, rule) persisted in SQLite once Telegram accepted
+  it – restarts don't re-fire, a failed send fires again next sweep
+• Sends spikes to Telegram from a background queue, one digest per sweep
+• --intervals: 5m/15m/1h/4h at once, coarser candles summed from 5m data
+• --rules: extra rules on rolling baselines (median, z-score, EMA cross);
+  only the baseline candles missing from the store are downloaded, and a
+  symbol whose window still has a gap is skipped rather than misjudged
+• --stream: opt-in WebSocket mode, evaluates on every kline_1h update
+• --metrics-port: Prometheus /metrics (sweep time, Binance latency / weight,
+  spikes per rule, Telegram sends, scheduler lateness)
 """
 
+import argparse
+import functools
+import logging
 import time
-import datetime
-import requests
-import sys
 import warnings
-from requests.adapters import HTTPAdapter
-from urllib3.util.retry import Retry
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+import alert_queue
+import alert_state
+import exchanges
+import jsonlog
+import kline_store
+import kline_stream
+import metrics
+import multi_interval
+import scheduler
+import spike_rules
+from binance_limiter import binance_session, endpoint_weight
+from spike_rules import spike_mask
 
 warnings.filterwarnings("ignore", category=DeprecationWarning)
 
-API = "https://fapi.binance.com"
+log = jsonlog.setup("hourly_volume_alert")
+
 INTERVAL = "1h"
 VOLUME_MULTIPLE = 3
 MIN_QUOTE_VOL = 3_000_000      # ~$3 M
+MAX_WORKERS = 16               # concurrent kline requests per sweep
+HOUR_MS = 3_600_000
+# An hour inside the rolling 24 h window can't beat the window itself,
+# so < MIN_QUOTE_VOL over 24 h can never spike.  Raise to prune harder.
+PREFILTER_MIN_24H = MIN_QUOTE_VOL
 
 # Telegram
 import os
 TELEGRAM_TOKEN  = os.getenv("TELEGRAM_TOKEN")
 CHAT_ID         = os.getenv("CHAT_ID")
+telegram = alert_queue.TelegramQueue(TELEGRAM_TOKEN, CHAT_ID)
+
+# Track last-alerted hour per symbol (candle open hour, epoch ms)
+last_alert: dict[str, int] = {}
+
+# Every alert sent, persisted so a restart doesn't re-fire (see restore_state)
+state = alert_state.AlertState()
+
+# Closed hourly candles, persisted between sweeps and restarts
+store = kline_store.KlineStore()
+# symbol → its first candle's open, once a baseline backfill came back short
+# (listed less than --rules' window ago: older candles will never exist)
+listed: dict[str, int] = {}
+
+# Multi-interval mode (--intervals): 5m candles, coarser ones derived locally
+BASE_MS = multi_interval.BASE_MS
+intervals: list[multi_interval.IntervalSpec] = []
+store_5m: kline_store.KlineStore | None = None     # opened by --intervals
+listed_5m: dict[str, int] = {}                     # as `listed`, for 5m candles
+interval_alerts: dict[tuple[str, str], int] = {}   # (sym, interval) → candle open
+
+# Venues scanned each sweep (--venues); symbols keyed as in exchanges.py
+venues: list[exchanges.Exchange] = [exchanges.VENUES["binance"]]
 
-# Track last-alerted hour per symbol
-last_alert: dict[str, datetime.datetime] = {}
+# Optional extra rules on rolling baselines (--rules); None = classic only
+detector: spike_rules.Detector | None = None
+
+# Prometheus metrics (served with --metrics-port)
+sweep_seconds = metrics.Histogram("sweep_seconds", "Wall time of one sweep",
+                                  ("mode",), metrics.SWEEP_BUCKETS)
+symbols_scanned = metrics.Gauge("symbols_scanned",
+                                "Symbols evaluated in the last sweep")
+spikes_total = metrics.Counter("spikes_total", "Spike alerts fired by rule",
+                               ("rule",))
+tick_lateness = metrics.Gauge("scheduler_lateness_seconds",
+                              "Last tick's start minus its boundary")
+tick_overrun = metrics.Gauge("scheduler_overrun_seconds",
+                             "Last sweep's overrun past the next boundary")
 
 # ─────────────────────── requests session ───────────────────────
-session = requests.Session()
-session.mount(
-    "https://",
-    HTTPAdapter(max_retries=Retry(total=3, backoff_factor=1,
-                                  status_forcelist=[429, 500, 502, 503, 504]))
-)
+session = binance_session(pool_maxsize=MAX_WORKERS)
 
 # ────────────────────────── helpers ────────────────────────────
 
@@ -53,105 +123,368 @@ def fmt(vol: float) -> str:
     return f"{vol:,.0f}"
 
 
-def tg_send(text: str):
+def tg_send(text: str, done=None):
+    """Queue an alert; the sender thread batches and delivers it, then
+    calls done(ok)."""
+    telegram.put(text, done)
+
+
+def delivered(dedupe: dict, key, sym: str, hour: int, rule: str,
+              score: float, ok: bool) -> None:
+    """Telegram callback: record a sent alert in the state store; free the
+    dedupe key of one that wasn't, so the next sweep fires it again."""
+    if ok:
+        state.record(sym, hour, rule, score)
+    elif dedupe.get(key) == hour:
+        dedupe.pop(key, None)
+
+
+def active_perps() -> list[str]:
+    """Symbol keys across every configured venue."""
+    return exchanges.universe(session, venues)
+
+
+def venue_volumes(ex: exchanges.Exchange) -> dict[str, float] | None:
     try:
-        r = session.get(
-            f"https://api.telegram.org/bot{TELEGRAM_TOKEN}/sendMessage",
-            params={"chat_id": CHAT_ID, "text": text},
-            timeout=5,
-        )
-        if r.status_code != 200:
-            print(f"Telegram error {r.status_code}: {r.text[:120]}")
+        return {ex.key(s): v for s, v in ex.volumes_24h(session).items()}
     except Exception as e:
-        print("Telegram send exception:", e)
+        log.warning("Prefilter skipped for %s: %s", ex.name, e)
+        return None
 
 
-def active_perps() -> list[str]:
-    r = session.get(f"{API}/fapi/v1/exchangeInfo", timeout=10)
-    if r.status_code != 200:
-        print("Binance HTTP", r.status_code, r.text[:120])
-        return []
-    info = r.json()
-    if "symbols" not in info:          # <— add
-        print("Unexpected response:", str(info)[:200])
-        return []
-    return [
-        s["symbol"] for s in info["symbols"]
-        if s["contractType"] == "PERPETUAL"
-        and s["quoteAsset"] == "USDT"
-        and s["status"] == "TRADING"
-    ]
-
-
-def last_two_closed_klines(sym: str):
-    kl = session.get(f"{API}/fapi/v1/klines",
-                     params={"symbol": sym, "interval": INTERVAL, "limit": 3},
-                     timeout=10).json()
+def prefilter(syms: list[str], min_24h: float = PREFILTER_MIN_24H) -> list[str]:
+    """Keep symbols whose 24 h quote volume still allows a spike."""
+    with ThreadPoolExecutor(max_workers=len(venues)) as pool:
+        got = dict(zip(venues, pool.map(venue_volumes, venues)))
+    vol24 = {k: v for vols in got.values() if vols for k, v in vols.items()}
+    checked = [ex for ex, vols in got.items() if vols is not None]
+    kept = [s for s in syms if vol24.get(s, min_24h) >= min_24h]
+
+    dropped = [s for s in syms if vol24.get(s, min_24h) < min_24h]
+    weight_saved = (sum(endpoint_weight(exchanges.resolve(s)[0].klines_url,
+                                        {"limit": 3}) for s in dropped)
+                    - sum(endpoint_weight(ex.tickers_url) for ex in checked))
+    log.info("Prefilter: %d/%d symbols kept, %d requests / %d weight saved",
+             len(kept), len(syms), len(dropped) - len(checked), weight_saved)
+    return kept
+
+
+def fetch_klines(sym: str, limit: int, interval: str = INTERVAL) -> list:
+    """(open_ms, close_ms, quote_vol) candles for a symbol key, oldest first."""
+    ex, venue_sym = exchanges.resolve(sym)
+    return ex.klines(session, venue_sym, interval, limit)
+
+
+def baseline_start(sym: str, curr_open: int) -> int:
+    """Open of the oldest candle the --rules window before *curr_open* can
+    hold – later than the full window for a recently listed symbol."""
+    return max(curr_open - detector.window * HOUR_MS, listed.get(sym, 0))
+
+
+def kline_pair(sym: str, top_of_hour: bool):
+    """
+    (prev_vol, curr_vol, curr_open_ms) for *sym*, or None on failure.
+    Closed candles are served from the local store, so normally only the
+    open candle (plus the just-closed one at hh:00) is downloaded.
+    """
     now_ms = int(time.time() * 1000)
-    closed = [k for k in kl if k[6] < now_ms]
-    return closed[-2:] if len(closed) >= 2 else []
+    hour = now_ms // HOUR_MS * HOUR_MS
+    curr_open = hour - HOUR_MS if top_of_hour else hour
+    limit = 1 + top_of_hour + (not store.has_closed(sym, curr_open - HOUR_MS))
+    if detector:                                   # baseline backfill, gaps only
+        first = baseline_start(sym, curr_open)
+        miss = store.oldest_missing(sym, curr_open - HOUR_MS,
+                                    (curr_open - first) // HOUR_MS)
+        if miss is not None:
+            limit = max(limit, (hour - miss) // HOUR_MS + 1)
+    try:
+        kl = fetch_klines(sym, limit)
+        if len(kl) < limit and kl:
+            listed[sym] = kl[0][0]
+        store.put_klines(sym, kl, now_ms)
+        curr = [k for k in kl if k[1] < now_ms][-1] if top_of_hour else kl[-1]
+        prev = store.get(sym, curr[0] - HOUR_MS)
+    except Exception:
+        return None
+    if prev is None:
+        return None
+    return prev[0], curr[2], curr[0]
+
+
+def fetch_sweep(syms: list[str], top_of_hour: bool) -> list:
+    """Fetch kline pairs for every symbol concurrently, in symbol order."""
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as pool:
+        pairs = list(pool.map(lambda s: kline_pair(s, top_of_hour), syms))
+    store.flush()
+    return pairs
 
 # ─────────────────────── core scan function ─────────────────────
 
 
-def scan(top_of_hour: bool) -> None:
-    for sym in active_perps():
-        try:
-            if top_of_hour:
-                prev, curr = last_two_closed_klines(sym)
-            else:
-                kl = session.get(f"{API}/fapi/v1/klines",
-                                 params={"symbol": sym,
-                                         "interval": INTERVAL, "limit": 2},
-                                 timeout=10).json()
-                prev, curr = kl[-2], kl[-1]
-        except Exception:
+def alert(sym: str, prev_vol: float, curr_vol: float, ratio: float,
+          hour: int) -> None:
+    last_alert[sym] = int(hour)
+    spikes_total.inc(rule="classic")
+    log.info("VOLUME SPIKE %s %.2f×", sym, ratio,
+             extra={"symbol": sym, "rule": "classic", "prev": float(prev_vol),
+                    "curr": float(curr_vol), "ratio": round(float(ratio), 4),
+                    "hour": int(hour)})
+    tg_send(f"{sym} hourly volume {fmt(curr_vol)} "
+            f"({ratio:.2f}× prev) — VOLUME SPIKE!",
+            functools.partial(delivered, last_alert, sym, sym, int(hour),
+                              "classic", float(ratio)))
+
+
+def check_spike(sym: str, prev_vol: float, curr_vol: float,
+                open_ms: int) -> tuple[float, bool]:
+    """Single-symbol spike_mask(); alerts Telegram on a spike."""
+    ratio, spike, hour = spike_mask(prev_vol, curr_vol, open_ms,
+                                    last_alert.get(sym, -1),
+                                    VOLUME_MULTIPLE, MIN_QUOTE_VOL)
+    if spike:
+        alert(sym, prev_vol, curr_vol, float(ratio), hour)
+    return float(ratio), bool(spike)
+
+
+def run_rules(syms: list[str], curr_vol, hour) -> None:
+    """Catch the detector's windows up from the store, then apply its rules.
+    A symbol whose stored window has a gap is skipped until kline_pair()
+    backfills it – a hole would otherwise slip into its baseline."""
+    gaps = 0
+    for i, sym in enumerate(syms):
+        h = int(hour[i])
+        first = baseline_start(sym, h)
+        if store.oldest_missing(sym, h - HOUR_MS, (h - first) // HOUR_MS) is not None:
+            gaps += 1
             continue
+        start = max(detector.win(sym).last_open + HOUR_MS, first)
+        for open_ms, vol in store.history(sym, h - HOUR_MS, (h - start) // HOUR_MS):
+            detector.observe(sym, open_ms, vol)
+
+        for rule, score in detector.evaluate(sym, h, curr_vol[i]):
+            spikes_total.inc(rule=f"rule:{rule}")
+            log.info("VOLUME SPIKE %s %s %.2f", sym, rule, score,
+                     extra={"symbol": sym, "rule": f"rule:{rule}",
+                            "curr": float(curr_vol[i]),
+                            "score": round(float(score), 4), "hour": h})
+            tg_send(f"{sym} hourly volume {fmt(curr_vol[i])} "
+                    f"— {rule} rule {score:.2f} — VOLUME SPIKE!",
+                    functools.partial(delivered, detector.fired, (sym, rule),
+                                      sym, h, f"rule:{rule}", float(score)))
+    if gaps:
+        log.info("Rules skipped for %d symbols with gaps in their window", gaps,
+                 extra={"gaps": gaps})
+
+
+def scan(top_of_hour: bool) -> None:
+    t0 = time.perf_counter()
+    syms = prefilter(active_perps())
+    pairs = fetch_sweep(syms, top_of_hour)
+    fetched = time.perf_counter() - t0
+
+    ok = [i for i, p in enumerate(pairs) if p is not None]
+    syms = [syms[i] for i in ok]
+    sweep = np.array([pairs[i] for i in ok], dtype=np.float64).reshape(-1, 3)
+    prev_vol, curr_vol = sweep[:, 0], sweep[:, 1]
+    last = np.fromiter((last_alert.get(s, -1) for s in syms),
+                       dtype=np.int64, count=len(syms))
+    ratio, spike, hour = spike_mask(prev_vol, curr_vol, sweep[:, 2], last,
+                                    VOLUME_MULTIPLE, MIN_QUOTE_VOL)
+    low_vol = (ratio >= VOLUME_MULTIPLE) & (curr_vol < MIN_QUOTE_VOL)
+
+    for i in np.flatnonzero(spike):
+        alert(syms[i], prev_vol[i], curr_vol[i], ratio[i], hour[i])
+
+    if log.isEnabledFor(logging.DEBUG):     # the per-symbol table is routine
+        for i, sym in enumerate(syms):
+            log.debug("%-12s prev: %9s  curr: %9s  (%5.2f×)%s", sym,
+                      fmt(prev_vol[i]), fmt(curr_vol[i]), ratio[i],
+                      " (ratio hit, volume < min)" if low_vol[i] else "",
+                      extra={"symbol": sym, "prev": float(prev_vol[i]),
+                             "curr": float(curr_vol[i]),
+                             "ratio": round(float(ratio[i]), 4)})
+
+    if detector:
+        run_rules(syms, curr_vol, hour)
+    telegram.flush()
+
+    symbols_scanned.set(len(ok))
+    sweep_seconds.observe(time.perf_counter() - t0, mode="classic")
+    total = time.perf_counter() - t0
+    log.info("Sweep: %d symbols, %d ok, fetched in %.2fs, total %.2fs",
+             len(pairs), len(ok), fetched, total,
+             extra={"symbols": len(pairs), "ok": len(ok), "spikes": int(spike.sum()),
+                    "fetch_s": round(fetched, 3), "total_s": round(total, 3)})
+
+
+# ──────────────────────── multi-interval ────────────────────────
+
+
+def fetch_base(sym: str, tick: int, n: int, now_ms: int) -> bool:
+    """Bring *sym*'s 5m store up to date, downloading only missing candles
+    (none from before its listing, once a download came back short)."""
+    first = max(tick - (n - 1) * BASE_MS, listed_5m.get(sym, 0))
+    miss = store_5m.oldest_missing(sym, tick - BASE_MS, (tick - first) // BASE_MS)
+    limit = 1 if miss is None else (tick - miss) // BASE_MS + 1
+    try:
+        kl = fetch_klines(sym, limit, multi_interval.BASE)
+        if len(kl) < limit and kl:
+            listed_5m[sym] = kl[0][0]
+        store_5m.put_klines(sym, kl, now_ms)
+    except Exception:
+        return False
+    return True
 
-        prev_vol = float(prev[7])
-        curr_vol = float(curr[7])
-        ratio = curr_vol / prev_vol if prev_vol else 0
 
-        curr_hour = datetime.datetime.fromtimestamp(
-            curr[0] / 1000, datetime.timezone.utc).replace(minute=0, second=0, microsecond=0)
+def scan_intervals(specs: list) -> None:
+    """One 5m fetch per symbol, every configured interval derived locally."""
+    t0 = time.perf_counter()
+    now_ms = int(time.time() * 1000)
+    tick = now_ms // BASE_MS * BASE_MS
+    first = multi_interval.first_open(tick, specs)
+    n = (tick - first) // BASE_MS + 1
+
+    syms = prefilter(active_perps(), min(s.min_quote_vol for s in specs))
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as pool:
+        ok = list(pool.map(lambda s: fetch_base(s, tick, n, now_ms), syms))
+    store_5m.flush()
+    syms = [s for s, good in zip(syms, ok) if good]
+    fetched = time.perf_counter() - t0
+
+    vols = np.array([store_5m.volumes(s, first, n) for s in syms]).reshape(-1, n)
+    for spec in specs:
+        prev_vol, curr_vol, curr_open, complete = multi_interval.aggregate(
+            vols, first, tick, spec)
+        last = np.fromiter((interval_alerts.get((s, spec.name), -spec.cooldown_ms)
+                            for s in syms), dtype=np.int64, count=len(syms))
+        ratio, spike, hour = spike_mask(prev_vol, curr_vol, curr_open, last,
+                                        spec.multiple, spec.min_quote_vol,
+                                        spec.ms)
+        spike &= complete & (hour - last >= spec.cooldown_ms)
+
+        for i in np.flatnonzero(spike):
+            interval_alerts[syms[i], spec.name] = int(hour[i])
+            spikes_total.inc(rule=f"iv:{spec.name}")
+            log.info("VOLUME SPIKE %s %s %.2f×", syms[i], spec.name, ratio[i],
+                     extra={"symbol": syms[i], "rule": f"iv:{spec.name}",
+                            "prev": float(prev_vol[i]), "curr": float(curr_vol[i]),
+                            "ratio": round(float(ratio[i]), 4),
+                            "hour": int(hour[i])})
+            tg_send(f"{syms[i]} {spec.name} volume {fmt(curr_vol[i])} "
+                    f"({ratio[i]:.2f}× prev) — VOLUME SPIKE!",
+                    functools.partial(delivered, interval_alerts,
+                                      (syms[i], spec.name), syms[i],
+                                      int(hour[i]), f"iv:{spec.name}",
+                                      float(ratio[i])))
+        log.info("%s: %d/%d complete, %d spikes", spec.name,
+                 int(complete.sum()), len(syms), int(spike.sum()))
 
-        already = last_alert.get(sym) == curr_hour
-        spike = (ratio >= VOLUME_MULTIPLE) and (
-            curr_vol >= MIN_QUOTE_VOL) and not already
+    telegram.flush()
+    symbols_scanned.set(len(syms))
+    sweep_seconds.observe(time.perf_counter() - t0, mode="intervals")
+    total = time.perf_counter() - t0
+    log.info("Sweep: %d symbols × %d intervals, fetched in %.2fs, total %.2fs",
+             len(syms), len(specs), fetched, total,
+             extra={"symbols": len(syms), "intervals": len(specs),
+                    "fetch_s": round(fetched, 3), "total_s": round(total, 3)})
 
-        if spike:
-            last_alert[sym] = curr_hour
 
-        line = (f"{sym:<12}  prev: {fmt(prev_vol):>9}  "
-                f"curr: {fmt(curr_vol):>9}  "
-                f"({ratio:5.2f}×)")
-        if spike:
-            print(f"\033[95;1m{line}  ← VOLUME SPIKE!\033[0m")
-            tg_send(f"{sym} hourly volume {fmt(curr_vol)} "
-                    f"({ratio:.2f}× prev) — VOLUME SPIKE!")
-        else:
-            note = " (ratio hit, volume < min)" if ratio >= VOLUME_MULTIPLE and curr_vol < MIN_QUOTE_VOL else ""
-            print(f"{line}{note}")
+# ───────────────────────── stream mode ──────────────────────────
 
 
+def on_stream_update(sym: str, prev_vol: float, curr_vol: float,
+                     open_ms: int) -> None:
+    check_spike(sym, prev_vol, curr_vol, open_ms)
+
+
+def run_stream(syms: list[str], ws_url: str) -> None:
+    """Evaluate the spike rule on every kline update instead of polling."""
+    book = kline_stream.HourlyVolumeBook()
+    for sym, pair in zip(syms, fetch_sweep(syms, top_of_hour=False)):
+        if pair is not None:
+            book.seed(sym, *pair)
+    kline_stream.run(syms, book, on_stream_update, ws_url)
+
 # ───────────────────────── main loop ────────────────────────────
-print("Hourly-volume alert running…  (Ctrl-C to stop)")
-while True:
-    utc_now = datetime.datetime.utcnow().replace(tzinfo=datetime.timezone.utc)
-    top_of_hour = (utc_now.minute == 0)
 
-    print("Starting volume scan…", flush=True)
+
+def restore_state() -> None:
+    """Reload dedupe state for every rule family from the alert store."""
+    pruned = state.prune()
+    fired = state.latest()
+    for (sym, rule), hour in fired.items():
+        family, _, name = rule.partition(":")
+        if family == "classic":
+            last_alert[sym] = hour
+        elif family == "iv":
+            interval_alerts[sym, name] = hour
+        elif family == "rule" and detector:
+            detector.fired[sym, name] = hour
+    log.info("Alert state: %d entries restored, %d pruned", len(fired), pruned)
+
+
+def run_polling() -> None:
+    prev = None
+    for tick in scheduler.BoundaryScheduler(300).ticks():
+        if prev is not None:
+            tick_overrun.set(prev.overrun)
+        prev = tick
+        tick_lateness.set(tick.lateness)
+        log.info("Starting volume scan… (%s)", tick,
+                 extra={"lateness": round(tick.lateness, 3), "missed": tick.missed})
+        try:
+            if intervals:
+                scan_intervals(intervals)
+            else:
+                # a late or catch-up tick still judges the hour it skipped
+                scan(tick.top_of_hour)
+            state.prune()
+        except Exception as e:
+            log.exception("Sweep failed: %s", e)
+
+
+if __name__ == "__main__":
+    p = argparse.ArgumentParser(description="Hourly volume spike alert")
+    p.add_argument("--stream", action="store_true",
+                   help="evaluate on every kline WebSocket update "
+                        "instead of polling REST every 5 min")
+    p.add_argument("--ws-url", default=kline_stream.STREAM_URL)
+    p.add_argument("--symbols", help="comma-separated subset to watch")
+    p.add_argument("--rules", help="extra rolling-baseline rules, e.g. "
+                                   "'median=4,zscore=4,ema=6/24x2' (polling "
+                                   "mode, hourly scan – not with --intervals)")
+    p.add_argument("--intervals", help="scan several intervals from 5m data, "
+                                       "e.g. '5m,15m:4:1e6:3600,1h,4h' "
+                                       "(name[:multiple[:min_vol[:cooldown_s]]])")
+    p.add_argument("--venues", default="binance",
+                   help="comma-separated venues to scan together: "
+                        f"{','.join(exchanges.VENUES)} (polling mode)")
+    p.add_argument("--metrics-port", type=int,
+                   help="serve Prometheus metrics on this port")
+    args = p.parse_args()
+    if args.rules and args.intervals:
+        p.error("--rules applies to the hourly scan; it can't be combined "
+                "with --intervals")
     try:
-        scan(top_of_hour)
-    except Exception as e:
-        print("⚠️  Error:", e)
-
-    # Sleep until next 5-minute boundary
-    utc_now = datetime.datetime.utcnow()
-    seconds = utc_now.minute * 60 + utc_now.second
-    wait_sec = (300 - (seconds % 300)) or 300
-    for r in range(wait_sec, 0, -1):
-        sys.stdout.write(f"\r… next check in {r:3d}s ")
-        sys.stdout.flush()
-        time.sleep(1)
-    print()
+        venues = exchanges.parse_venues(args.venues)
+        intervals = multi_interval.parse_specs(args.intervals) if args.intervals else []
+        rules = spike_rules.parse_rules(args.rules) if args.rules else None
+    except ValueError as e:
+        p.error(str(e))
+    if intervals:
+        store_5m = kline_store.KlineStore("kline_store_5m.bin", BASE_MS, slots=120)
+        log.info("Intervals: %s", ", ".join(map(repr, intervals)))
+    if rules:
+        detector = spike_rules.Detector(rules, min_quote_vol=MIN_QUOTE_VOL)
+
+    log.info("Hourly-volume alert running…  (Ctrl-C to stop)")
+    if args.metrics_port:
+        metrics.serve(args.metrics_port)
+    restore_state()
+    if args.stream:
+        # the kline WebSocket is Binance USDT-M only, whatever --venues says
+        syms = (args.symbols.split(",") if args.symbols
+                else exchanges.VENUES["binance"].symbols(session))
+        run_stream(syms, args.ws_url)
+    else:
+        run_polling()
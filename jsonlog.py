@@ -0,0 +1,115 @@
+"""
+Structured logging for the bots and dashboards
+──────────────────────────────────────────────
+• One JSON object per line: ts, level, logger, msg + any extra= fields
+• Level from LOG_LEVEL (default INFO) – per-symbol / per-message lines are
+  DEBUG, so the default costs one isEnabledFor() check per sweep
+• LOG_SAMPLE=N keeps 1 in N routine (DEBUG) records per message template;
+  INFO and above – spikes, sweep summaries, errors – are never sampled
+• Records go through a QueueHandler; a listener thread does the formatting
+  and the write, so a slow stdout never stalls a sweep
+• LOG_FORMAT=text for a human-readable console instead of JSON
+
+Usage:  log = jsonlog.setup("hourly_volume_alert")
+        log.info("volume spike", extra={"symbol": sym, "ratio": 3.4})
+"""
+
+import atexit
+import copy
+import itertools
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import sys
+import threading
+import time
+
+LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+FORMAT = os.getenv("LOG_FORMAT", "json")
+SAMPLE = int(os.getenv("LOG_SAMPLE", "1"))
+
+# attributes every LogRecord has – anything else came in through extra=
+_RESERVED = set(vars(logging.makeLogRecord({}))) | {"message", "asctime"}
+
+_listener: logging.handlers.QueueListener | None = None
+_lock = threading.Lock()
+
+
+def fields(record: logging.LogRecord) -> dict:
+    return {k: v for k, v in vars(record).items() if k not in _RESERVED}
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        out = {"ts": round(record.created, 3),
+               "level": record.levelname,
+               "logger": record.name,
+               "msg": record.getMessage()}
+        out.update(fields(record))
+        if record.exc_text:
+            out["exc"] = record.exc_text
+        return json.dumps(out, default=str, ensure_ascii=False)
+
+
+class TextFormatter(logging.Formatter):
+    def __init__(self):
+        super().__init__("%(asctime)s %(levelname)-7s %(name)s: %(message)s",
+                         "%H:%M:%S")
+        self.converter = time.gmtime
+
+    def format(self, record: logging.LogRecord) -> str:
+        line = super().format(record)
+        extra = " ".join(f"{k}={v}" for k, v in fields(record).items())
+        return f"{line}  {extra}" if extra else line
+
+
+class SampleFilter(logging.Filter):
+    """Let through 1 in *every* DEBUG records of each message template."""
+
+    def __init__(self, every: int):
+        super().__init__()
+        self.every = every
+        self.seen: dict[tuple, itertools.count] = {}
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if self.every <= 1 or record.levelno >= logging.INFO:
+            return True
+        key = (record.name, record.msg)
+        n = next(self.seen.setdefault(key, itertools.count()))
+        return n % self.every == 0
+
+
+class _QueueHandler(logging.handlers.QueueHandler):
+    """Merge args into msg on the caller's thread, leave the rest to the
+    listener (the stock prepare() runs the whole formatter here)."""
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.msg = record.message = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+def setup(name: str, level: str = LEVEL, fmt: str = FORMAT,
+          sample: int = SAMPLE) -> logging.Logger:
+    """Route the root logger through the async handler once; return *name*."""
+    global _listener
+    with _lock:
+        if _listener is None:
+            out = logging.StreamHandler(sys.stdout)
+            out.setFormatter(TextFormatter() if fmt == "text" else JsonFormatter())
+            q: queue.Queue = queue.Queue(-1)
+            handler = _QueueHandler(q)
+            handler.addFilter(SampleFilter(sample))
+            root = logging.getLogger()
+            root.handlers[:] = [handler]
+            root.setLevel(level)
+            _listener = logging.handlers.QueueListener(q, out)
+            _listener.start()
+            atexit.register(_listener.stop)        # drain the queue on exit
+    return logging.getLogger(name)
@@ -0,0 +1,153 @@
+"""
+Rolling per-symbol kline store (memory-mapped)
+──────────────────────────────────────────────
+• One fixed-size ring of candles per symbol, slot = open_time // interval
+• Records are (open_ms, quote_vol, closed) in a NumPy structured array
+• Backed by a memory-mapped file + small JSON symbol index, so a restart
+  picks up where the last sweep left off without a warm-up fetch
+
+Closed candles never change, so once one is stored the scanner only has
+to fetch the open candle.
+"""
+
+import json
+import os
+import threading
+
+import numpy as np
+
+HOUR_MS = 3_600_000
+SLOTS = 192                     # a week of closed hours + the open candle
+STORE_FILE = "kline_store.bin"
+
+RECORD = np.dtype([("open", "<i8"), ("vol", "<f8"), ("closed", "u1")],
+                  align=True)
+
+
+class KlineStore:
+    """Array-backed ring buffer of candles per symbol, keyed by open time."""
+
+    def __init__(self, path: str = STORE_FILE, interval_ms: int = HOUR_MS,
+                 slots: int = SLOTS, capacity: int = 512):
+        self.path = path
+        self.meta_path = f"{path}.json"
+        self.interval_ms = interval_ms
+        self.slots = slots
+        self.index: dict[str, int] = {}
+        self.lock = threading.Lock()
+        self.dirty = False
+
+        meta = self._load_meta()
+        if (meta.get("interval_ms") == interval_ms and meta.get("slots") == slots
+                and os.path.exists(path)):
+            self.index = meta["index"]
+            capacity = max(capacity, meta["capacity"])
+        else:
+            self.index = {}
+        self._map(capacity, fresh=not self.index)
+
+    # ── storage ──
+    def _load_meta(self) -> dict:
+        try:
+            with open(self.meta_path) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _map(self, capacity: int, fresh: bool = False) -> None:
+        """(Re)map the backing file at *capacity* rows, keeping old rows."""
+        old = None if fresh else getattr(self, "data", None)
+        size = capacity * self.slots * RECORD.itemsize
+        if fresh or not os.path.exists(self.path):
+            open(self.path, "wb").close()
+        if os.path.getsize(self.path) < size:
+            if old is not None:
+                old.flush()
+            with open(self.path, "r+b") as f:
+                f.truncate(size)
+        self.capacity = capacity
+        self.data = np.memmap(self.path, dtype=RECORD, mode="r+",
+                              shape=(capacity, self.slots))
+
+    def _row(self, sym: str) -> int:
+        row = self.index.get(sym)
+        if row is not None:
+            return row
+        with self.lock:
+            if sym not in self.index:
+                if len(self.index) >= self.capacity:
+                    self._map(self.capacity * 2)
+                self.index[sym] = len(self.index)
+                self.dirty = True
+            return self.index[sym]
+
+    def flush(self) -> None:
+        """Sync candle data and (if it changed) the symbol index to disk."""
+        self.data.flush()
+        if not self.dirty:
+            return
+        tmp = f"{self.meta_path}.tmp"
+        with open(tmp, "w") as f:
+            json.dump({"interval_ms": self.interval_ms, "slots": self.slots,
+                       "capacity": self.capacity, "index": self.index}, f)
+        os.replace(tmp, self.meta_path)
+        self.dirty = False
+
+    # ── candles ──
+    def put(self, sym: str, open_ms: int, quote_vol: float,
+            closed: bool) -> None:
+        row = self._row(sym)                      # may grow / remap self.data
+        rec = self.data[row, (open_ms // self.interval_ms) % self.slots]
+        rec["open"], rec["vol"], rec["closed"] = open_ms, quote_vol, closed
+
+    def put_klines(self, sym: str, klines: list, now_ms: int) -> None:
+        """Store (open_ms, close_ms, quote_vol) candles – see exchanges.py;
+        closed = close time already passed."""
+        for open_ms, close_ms, vol in klines:
+            self.put(sym, open_ms, vol, close_ms < now_ms)
+
+    def get(self, sym: str, open_ms: int):
+        """(quote_vol, closed) for the candle opening at *open_ms*, or None."""
+        row = self.index.get(sym)
+        if row is None:
+            return None
+        rec = self.data[row, (open_ms // self.interval_ms) % self.slots]
+        if rec["open"] != open_ms:
+            return None
+        return float(rec["vol"]), bool(rec["closed"])
+
+    def has_closed(self, sym: str, open_ms: int) -> bool:
+        got = self.get(sym, open_ms)
+        return got is not None and got[1]
+
+    def history(self, sym: str, end_open: int, n: int) -> list[tuple[int, float]]:
+        """Stored closed candles among the *n* ending at *end_open*, oldest first."""
+        row = self.index.get(sym)
+        if row is None or n <= 0:
+            return []
+        opens = end_open - self.interval_ms * np.arange(min(n, self.slots) - 1, -1, -1)
+        recs = self.data[row, (opens // self.interval_ms) % self.slots]
+        ok = (recs["open"] == opens) & (recs["closed"] == 1)
+        return list(zip(recs["open"][ok].tolist(), recs["vol"][ok].tolist()))
+
+    def oldest_missing(self, sym: str, end_open: int, n: int):
+        """Open time of the oldest non-closed candle among *n* ending at *end_open*."""
+        opens = end_open - self.interval_ms * np.arange(min(n, self.slots) - 1, -1, -1)
+        row = self.index.get(sym)
+        if row is None:
+            return int(opens[0]) if len(opens) else None
+        recs = self.data[row, (opens // self.interval_ms) % self.slots]
+        bad = np.flatnonzero((recs["open"] != opens) | (recs["closed"] == 0))
+        return int(opens[bad[0]]) if len(bad) else None
+
+    def volumes(self, sym: str, first_open: int, n: int) -> np.ndarray:
+        """Volumes of *n* consecutive candles from *first_open*; NaN where absent."""
+        out = np.full(n, np.nan)
+        row = self.index.get(sym)
+        if row is None:
+            return out
+        opens = first_open + self.interval_ms * np.arange(min(n, self.slots))
+        recs = self.data[row, (opens // self.interval_ms) % self.slots]
+        hit = recs["open"] == opens
+        out[:len(opens)][hit] = recs["vol"][hit]
+        return out
@@ -0,0 +1,111 @@
+"""
+Binance kline WebSocket stream → in-memory hourly volume book
+─────────────────────────────────────────────────────────────
+• Subscribes to combined <sym>@kline_1h streams (≤ 200 per connection)
+• Keeps previous / current hourly quote volume per symbol in memory
+• Calls back on every kline update so the spike rule runs in real time
+• Reconnects automatically (Binance drops every connection after 24 h)
+
+Needs:  pip install websockets
+"""
+
+import asyncio
+import json
+import logging
+
+log = logging.getLogger(__name__)
+
+STREAM_URL = "wss://fstream.binance.com/stream"
+MAX_STREAMS = 200               # Binance limit per combined-stream connection
+HOUR_MS = 3_600_000
+
+# ─────────────────────── volume book ────────────────────────────
+
+
+class HourlyVolumeBook:
+    """prev / curr hourly quote volume per symbol, fed by kline events."""
+
+    def __init__(self):
+        # sym -> [prev_open_ms, prev_vol, curr_open_ms, curr_vol]
+        self.book: dict[str, list] = {}
+
+    def seed(self, sym: str, prev_vol: float, curr_vol: float,
+             open_ms: int) -> None:
+        """Prime a symbol from a REST sweep so the rule can fire at once."""
+        self.book[sym] = [open_ms - HOUR_MS, prev_vol, open_ms, curr_vol]
+
+    def update(self, sym: str, open_ms: int, quote_vol: float):
+        """
+        Apply one kline update.  Returns (prev_vol, curr_vol, open_ms) for
+        the candle the update belongs to, or None while its predecessor's
+        volume is still unknown.
+        """
+        row = self.book.get(sym)
+        if row is None:
+            self.book[sym] = [None, None, open_ms, quote_vol]
+            return None
+        prev_open, prev_vol, curr_open, curr_vol = row
+
+        if open_ms == curr_open:
+            row[3] = quote_vol
+        elif open_ms > curr_open:                 # new hour started
+            adjacent = open_ms - curr_open == HOUR_MS
+            row[:] = [curr_open if adjacent else None,
+                      curr_vol if adjacent else None,
+                      open_ms, quote_vol]
+        elif open_ms == prev_open:                # late final of last hour
+            row[1] = quote_vol
+            return None
+        else:
+            return None
+
+        if row[1] is None:
+            return None
+        return row[1], row[3], row[2]
+
+# ─────────────────────── stream client ──────────────────────────
+
+
+def stream_urls(syms: list[str], base: str = STREAM_URL,
+                interval: str = "1h") -> list[str]:
+    """One combined-stream URL per chunk of MAX_STREAMS symbols."""
+    urls = []
+    for i in range(0, len(syms), MAX_STREAMS):
+        chunk = syms[i:i + MAX_STREAMS]
+        streams = "/".join(f"{s.lower()}@kline_{interval}" for s in chunk)
+        urls.append(f"{base}?streams={streams}")
+    return urls
+
+
+async def _consume(url: str, book: HourlyVolumeBook, on_update) -> None:
+    from websockets.asyncio.client import connect
+    from websockets.exceptions import ConnectionClosed
+
+    async for ws in connect(url, max_size=None):
+        try:
+            async for raw in ws:
+                msg = json.loads(raw)
+                k = msg.get("data", msg).get("k")
+                if not k:
+                    continue
+                res = book.update(k["s"], k["t"], float(k["q"]))
+                if res is not None:
+                    on_update(k["s"], *res)
+        except ConnectionClosed:
+            log.warning("Kline stream closed, reconnecting…")
+            continue
+
+
+async def _run(urls: list[str], book: HourlyVolumeBook, on_update) -> None:
+    await asyncio.gather(*(_consume(u, book, on_update) for u in urls))
+
+
+def run(syms: list[str], book: HourlyVolumeBook, on_update,
+        base: str = STREAM_URL) -> None:
+    """
+    Stream kline updates for *syms* forever.  on_update(sym, prev_vol,
+    curr_vol, open_ms) is called for every update once prev is known.
+    """
+    urls = stream_urls(syms, base)
+    log.info("Streaming %d symbols over %d connection(s)", len(syms), len(urls))
+    asyncio.run(_run(urls, book, on_update))
@@ -0,0 +1,136 @@
+"""
+Process-wide market data cache
+──────────────────────────────
+• One snapshot per endpoint per process, shared by every Streamlit session
+  and rerun – API load is one request per TTL however many tabs are open
+• Shared caches (shared()) keep themselves fresh: one refresher thread
+  per endpoint re-fetches before the TTL runs out, so a page rendered
+  minutes after the last one still gets a snapshot younger than the TTL
+• Stale-while-revalidate otherwise: an expired snapshot is served while a
+  single background thread refreshes it
+• Single-flight: concurrent misses (cold start) wait on one request
+  instead of each sending their own
+• A failed refresh keeps the last good snapshot; only a cold miss raises
+
+No Streamlit imports; the process-wide instances live in registry.py,
+which Streamlit's reruns don't re-execute.
+"""
+
+import logging
+import threading
+import time
+
+import requests
+
+import registry
+
+log = logging.getLogger(__name__)
+
+TTL_SECONDS = 60
+REFRESH_AHEAD = 0.8             # keep_fresh re-fetches at this share of the TTL
+
+
+class MarketCache:
+    """TTL snapshot of one JSON endpoint."""
+
+    def __init__(self, session: requests.Session, url: str,
+                 ttl: float = TTL_SECONDS, keep_fresh: bool = False):
+        self.session = session
+        self.url = url
+        self.ttl = ttl
+        self.keep_fresh = keep_fresh
+        self.refresher: threading.Thread | None = None
+        self.data = None
+        self.fetched_at = 0.0                     # wall clock of the snapshot
+        self.error: Exception | None = None       # last failure, if any
+        self.inflight: threading.Event | None = None
+        self.lock = threading.Lock()
+
+    def _fetch(self):
+        r = self.session.get(self.url, timeout=10)
+        r.raise_for_status()
+        return r.json()
+
+    def _load(self) -> None:
+        """Fetch once however many threads ask at the same time."""
+        with self.lock:
+            leader = self.inflight is None
+            if leader:
+                self.inflight = threading.Event()
+            done = self.inflight
+        if not leader:
+            done.wait()
+            if self.data is None and self.error is not None:
+                raise self.error
+            return
+        try:
+            data = self._fetch()
+            with self.lock:
+                self.data, self.fetched_at, self.error = data, time.time(), None
+        except Exception as e:
+            with self.lock:
+                self.error = e
+            raise
+        finally:
+            with self.lock:
+                self.inflight = None
+            done.set()
+
+    def _refresh_in_background(self) -> None:
+        with self.lock:
+            if self.inflight is not None:
+                return
+
+        def work():
+            try:
+                self._load()
+            except Exception as e:
+                log.warning("%s refresh failed, serving last snapshot: %s",
+                            self.url, e)
+
+        threading.Thread(target=work, daemon=True).start()
+
+    def _ensure_refresher(self) -> None:
+        with self.lock:
+            if self.refresher is None:
+                self.refresher = threading.Thread(target=self._refresh_loop,
+                                                  daemon=True)
+                self.refresher.start()
+
+    def _refresh_loop(self) -> None:
+        """Re-fetch at REFRESH_AHEAD of the TTL; after a failure, retry one
+        such period later."""
+        period = self.ttl * REFRESH_AHEAD
+        while True:
+            wait = self.fetched_at + period - time.time()
+            if wait > 0:
+                time.sleep(wait)
+                continue
+            try:
+                self._load()
+            except Exception as e:
+                log.warning("%s refresh failed, serving last snapshot: %s",
+                            self.url, e)
+                time.sleep(period)
+
+    def age(self) -> float:
+        return time.time() - self.fetched_at
+
+    def get(self) -> tuple[object, float]:
+        """(payload, fetched_at); only blocks when there is no snapshot yet."""
+        if self.keep_fresh:
+            self._ensure_refresher()
+        if self.data is None:
+            self._load()
+        elif self.age() > self.ttl:
+            self._refresh_in_background()
+        with self.lock:
+            return self.data, self.fetched_at
+
+
+def shared(session: requests.Session, url: str,
+           ttl: float = TTL_SECONDS) -> MarketCache:
+    """Process-wide MarketCache per URL – survives Streamlit reruns and is
+    kept fresh by its own refresher thread from the first get() on."""
+    return registry.instance(MarketCache, url, session, url, ttl,
+                             keep_fresh=True)
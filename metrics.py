@@ -0,0 +1,142 @@
+"""
+Minimal Prometheus-style metrics
+────────────────────────────────
+• Counter / Gauge / Histogram with labels, thread-safe, no dependencies
+• render() → Prometheus text exposition format (v0.0.4)
+• serve(port) exposes /metrics from a daemon thread
+
+Metrics are always collected (a dict update each); they're only served
+when a port is given, e.g. hourly_volume_alert.py --metrics-port 9108.
+"""
+
+import logging
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+log = logging.getLogger(__name__)
+
+REGISTRY: list["Metric"] = []
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+SWEEP_BUCKETS = (1, 2, 5, 10, 20, 30, 60, 120, 300)
+
+
+def _fmt_labels(names: tuple, values: tuple, extra: str = "") -> str:
+    parts = [f'{n}="{v}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+class Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, help: str, labels: tuple = ()):
+        self.name = name
+        self.help = help
+        self.labels = labels
+        self.values: dict[tuple, object] = {}
+        self.lock = threading.Lock()
+        REGISTRY.append(self)
+
+    def _key(self, labels: dict) -> tuple:
+        return tuple(str(labels.get(n, "")) for n in self.labels)
+
+    def render(self) -> list[str]:
+        out = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        with self.lock:
+            for key, v in self.values.items():
+                out.append(f"{self.name}{_fmt_labels(self.labels, key)} {v}")
+        return out
+
+
+class Counter(Metric):
+    kind = "counter"
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        key = self._key(labels)
+        with self.lock:
+            self.values[key] = self.values.get(key, 0) + amount
+
+
+class Gauge(Metric):
+    kind = "gauge"
+
+    def set(self, value: float, **labels) -> None:
+        with self.lock:
+            self.values[self._key(labels)] = value
+
+
+class Histogram(Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, labels: tuple = (),
+                 buckets: tuple = LATENCY_BUCKETS):
+        super().__init__(name, help, labels)
+        self.buckets = buckets
+
+    def observe(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        with self.lock:
+            h = self.values.get(key)
+            if h is None:
+                h = self.values[key] = [[0] * len(self.buckets), 0.0, 0]
+            for i, b in enumerate(self.buckets):
+                if value <= b:
+                    h[0][i] += 1
+            h[1] += value
+            h[2] += 1
+
+    def render(self) -> list[str]:
+        out = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        with self.lock:
+            for key, (counts, total, n) in self.values.items():
+                for b, c in zip(self.buckets, counts):
+                    le = _fmt_labels(self.labels, key, 'le="%s"' % b)
+                    out.append(f"{self.name}_bucket{le} {c}")
+                le = _fmt_labels(self.labels, key, 'le="+Inf"')
+                out.append(f"{self.name}_bucket{le} {n}")
+                out.append(f"{self.name}_sum{_fmt_labels(self.labels, key)} {total}")
+                out.append(f"{self.name}_count{_fmt_labels(self.labels, key)} {n}")
+        return out
+
+
+def render() -> str:
+    return "\n".join(line for m in REGISTRY for line in m.render()) + "\n"
+
+
+class _Handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?")[0] != "/metrics":
+            self.send_error(404)
+            return
+        body = render().encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):           # keep scrapes out of the logs
+        pass
+
+
+def serve(port: int, host: str = "0.0.0.0") -> ThreadingHTTPServer:
+    """Expose /metrics on *port* from a daemon thread."""
+    server = ThreadingHTTPServer((host, port), _Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    log.info("Metrics on http://%s:%s/metrics", host, port)
+    return server
+
+# ─────────────────────── shared metrics ─────────────────────────
+
+binance_requests = Counter("binance_requests_total",
+                           "Binance REST requests by endpoint and status",
+                           ("endpoint", "status"))
+binance_latency = Histogram("binance_request_seconds",
+                            "Binance REST request latency", ("endpoint",))
+binance_used_weight = Gauge("binance_used_weight_1m",
+                            "Last X-MBX-USED-WEIGHT-1M seen")
+telegram_latency = Histogram("telegram_send_seconds",
+                             "Telegram sendMessage latency")
+telegram_sends = Counter("telegram_sends_total",
+                         "Telegram sendMessage calls by status", ("status",))
@@ -0,0 +1,88 @@
+"""
+Multi-interval volume candles from one 5-minute pipeline
+────────────────────────────────────────────────────────
+• Only 5m klines are downloaded; 15m / 1h / 4h candles are summed locally
+• Every interval has its own multiple, minimum volume and cooldown
+• On an interval boundary the just-closed candle is judged against the one
+  before it (like the hh:00 rule); otherwise the open candle vs. the
+  previous closed one
+
+Spec string:  "5m,15m:4:1e6:3600,1h,4h"   name[:multiple[:min_vol[:cooldown_s]]]
+"""
+
+import numpy as np
+
+BASE = "5m"
+BASE_MS = 300_000
+INTERVAL_MS = {"5m": 300_000, "15m": 900_000, "30m": 1_800_000,
+               "1h": 3_600_000, "2h": 7_200_000, "4h": 14_400_000}
+
+
+class IntervalSpec:
+    """Thresholds and cooldown for one derived interval."""
+
+    def __init__(self, name: str, multiple: float, min_quote_vol: float,
+                 cooldown_s: float):
+        if name not in INTERVAL_MS:
+            raise ValueError(f"Unsupported interval: {name!r}")
+        self.name = name
+        self.ms = INTERVAL_MS[name]
+        self.multiple = multiple
+        self.min_quote_vol = min_quote_vol
+        # never alert twice for the same candle, whatever the cooldown
+        self.cooldown_ms = max(int(cooldown_s * 1000), self.ms)
+
+    def __repr__(self) -> str:
+        return (f"{self.name}(×{self.multiple:g}, ≥{self.min_quote_vol:,.0f}, "
+                f"cooldown {self.cooldown_ms // 1000}s)")
+
+
+DEFAULTS = {
+    "5m":  (5, 500_000, 30 * 60),
+    "15m": (4, 1_000_000, 60 * 60),
+    "30m": (3, 2_000_000, 60 * 60),
+    "1h":  (3, 3_000_000, 60 * 60),
+    "2h":  (3, 5_000_000, 2 * 60 * 60),
+    "4h":  (3, 10_000_000, 4 * 60 * 60),
+}
+
+
+def parse_specs(spec: str) -> list[IntervalSpec]:
+    specs = []
+    for part in filter(None, (p.strip() for p in spec.split(","))):
+        name, *args = part.split(":")
+        if name not in DEFAULTS:
+            raise ValueError(f"Unsupported interval: {name!r}")
+        vals = list(DEFAULTS[name])
+        for i, a in enumerate(args[:3]):
+            vals[i] = float(a)
+        specs.append(IntervalSpec(name, *vals))
+    return sorted(specs, key=lambda s: s.ms)
+
+
+def first_open(tick: int, specs: list[IntervalSpec]) -> int:
+    """Open time of the oldest 5m candle any interval needs at *tick*."""
+    oldest = tick
+    for s in specs:
+        curr = tick - s.ms if tick % s.ms == 0 else tick // s.ms * s.ms
+        oldest = min(oldest, curr - s.ms)
+    return oldest
+
+
+def aggregate(vols: np.ndarray, first: int, tick: int, spec: IntervalSpec):
+    """
+    Sum 5m volumes into this interval's prev / curr candles.
+
+    *vols* is (symbols × 5m slots) starting at *first*, with the open 5m
+    candle (at *tick*) last and NaN for gaps.  Returns (prev_vol, curr_vol,
+    curr_open, complete) – complete is False where a gap would make the
+    comparison wrong.
+    """
+    curr_open = tick - spec.ms if tick % spec.ms == 0 else tick // spec.ms * spec.ms
+    i0 = (curr_open - spec.ms - first) // BASE_MS
+    i1 = (curr_open - first) // BASE_MS
+    i2 = (min(curr_open + spec.ms, tick + BASE_MS) - first) // BASE_MS
+    prev, curr = vols[:, i0:i1], vols[:, i1:i2]
+    complete = ~(np.isnan(prev).any(axis=1) | np.isnan(curr).any(axis=1))
+    return (np.nansum(prev, axis=1), np.nansum(curr, axis=1),
+            np.full(len(vols), curr_open, dtype=np.int64), complete)
@@ -0,0 +1,112 @@
+"""
+Spike-threshold grid search over historical klines
+──────────────────────────────────────────────────
+• Grid of multiple × min volume × interval × cooldown, all in one pass:
+  each symbol's candle grid is built once per interval and every
+  (multiple, min volume, cooldown) is evaluated against it
+• Symbols are spread over a process pool (one worker per core)
+• Per combination: alert count, alerts per day, mean forward return and
+  hit rate = share of alerts followed by a |move| ≥ --hit within --horizon
+
+Run:  python param_sweep.py data/*.zip --multiple 2,3,4,5 \\
+          --min-vol 1e6,3e6,1e7 --interval 15m,1h,4h --cooldown 0,4h
+"""
+
+import argparse
+import glob
+import itertools
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+import backtest
+from multi_interval import INTERVAL_MS
+
+
+def parse_duration(text: str) -> int:
+    """'0', '90m', '4h', '1d' → milliseconds."""
+    units = {"m": 60_000, "h": 3_600_000, "d": 86_400_000}
+    if text[-1] in units:
+        return int(float(text[:-1]) * units[text[-1]])
+    return int(float(text) * 1000)
+
+
+def sweep_symbol(job) -> list[dict]:
+    """Every grid combination for one symbol (runs in a worker process)."""
+    sym, paths, grid, horizon, hit = job
+    df = backtest.load_dir(paths)[sym]
+    rows = []
+    for interval, combos in grid.items():
+        try:
+            cg = backtest.hour_grid(df, INTERVAL_MS[interval])
+        except ValueError:                 # data coarser than the interval
+            continue
+        for multiple, min_vol, cooldown in combos:
+            a = backtest.grid_alerts(sym, cg, multiple, min_vol,
+                                     parse_duration(cooldown))
+            ret = a[f"ret_{horizon}"].dropna() if len(a) else pd.Series(dtype=float)
+            rows.append({"interval": interval, "multiple": multiple,
+                         "min_vol": min_vol, "cooldown": cooldown,
+                         "alerts": len(a), "scored": len(ret),
+                         "hits": int((ret.abs() >= hit).sum()),
+                         "ret_sum": float(ret.sum()),
+                         "days": (df["open_time"].iat[-1] - df["open_time"].iat[0]) / 86_400_000})
+    return rows
+
+
+def run(files: list[str], multiples, min_vols, intervals, cooldowns,
+        horizon: str = "4h", hit: float = 0.01, workers: int | None = None) -> pd.DataFrame:
+    by_sym: dict[str, list[str]] = {}
+    for f in files:
+        by_sym.setdefault(os.path.basename(f).split("-")[0].upper(), []).append(f)
+    grid = {iv: list(itertools.product(multiples, min_vols, cooldowns))
+            for iv in intervals}
+    jobs = [(sym, paths, grid, horizon, hit) for sym, paths in by_sym.items()]
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        rows = [r for part in pool.map(sweep_symbol, jobs) for r in part]
+    if not rows:
+        return pd.DataFrame()
+
+    res = (pd.DataFrame(rows)
+           .groupby(["interval", "multiple", "min_vol", "cooldown"], sort=False)
+           .sum(numeric_only=True))
+    days = pd.DataFrame(rows).groupby("interval")["days"].max()
+    res["alerts/day"] = res["alerts"] / res.index.get_level_values("interval").map(days)
+    res["hit %"] = np.where(res["scored"] > 0, res["hits"] / res["scored"] * 100, np.nan)
+    res[f"mean ret_{horizon} %"] = np.where(
+        res["scored"] > 0, res["ret_sum"] / res["scored"] * 100, np.nan)
+    return res[["alerts", "alerts/day", "hit %", f"mean ret_{horizon} %"]].round(2)
+
+
+if __name__ == "__main__":
+    p = argparse.ArgumentParser(description="Grid search the spike thresholds")
+    p.add_argument("paths", nargs="+", help="kline files or globs")
+    p.add_argument("--multiple", default="2,3,4,5")
+    p.add_argument("--min-vol", default="1e6,3e6,1e7")
+    p.add_argument("--interval", default="1h")
+    p.add_argument("--cooldown", default="0", help="e.g. 0,2h,4h")
+    p.add_argument("--horizon", default="4h", choices=list(backtest.HORIZONS))
+    p.add_argument("--hit", type=float, default=0.01,
+                   help="|forward return| counted as a hit (fraction)")
+    p.add_argument("--workers", type=int, default=os.cpu_count())
+    p.add_argument("--out", help="write the result table to this CSV")
+    args = p.parse_args()
+
+    files = sorted({f for pat in args.paths for f in glob.glob(pat)})
+    t0 = time.perf_counter()
+    res = run(files,
+              [float(x) for x in args.multiple.split(",")],
+              [float(x) for x in args.min_vol.split(",")],
+              args.interval.split(","), args.cooldown.split(","),
+              args.horizon, args.hit, args.workers)
+    print(f"{len(files)} files, {len(res)} combinations "
+          f"in {time.perf_counter() - t0:.2f}s ({args.workers} workers)")
+    if len(res):
+        print(res.sort_values("hit %", ascending=False).to_string())
+        if args.out:
+            res.to_csv(args.out)
+            print(f"Results written to {args.out}")
@@ -0,0 +1,24 @@
+"""
+Process-wide instances
+──────────────────────
+• One cache / store object per class and key per process, shared by every
+  Streamlit session and rerun – Streamlit re-executes the page script but
+  not its imports, so a module-level registry outlives reruns
+• Creation happens under a lock: racing first calls get the same object
+
+Usage:  cache = registry.instance(MarketCache, url, session, url, ttl)
+"""
+
+import threading
+
+_instances: dict[tuple, object] = {}
+_lock = threading.Lock()
+
+
+def instance(cls, key, *args, **kwargs):
+    """The process-wide *cls* for *key*, built as cls(*args, **kwargs) on
+    first use; later calls return it whatever their arguments."""
+    with _lock:
+        if (cls, key) not in _instances:
+            _instances[cls, key] = cls(*args, **kwargs)
+        return _instances[cls, key]
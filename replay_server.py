@@ -0,0 +1,243 @@
+"""
+Local stand-in for the Binance USDT-M REST API
+──────────────────────────────────────────────
+• Serves the fixtures in fixtures/binance/ – exchangeInfo, klines,
+  ticker/24hr and premiumIndex, hand-built from Binance's documented
+  response schemas (not recorded traffic)
+• --symbols N scales the universe: the fixture perps are cloned into
+  synthetic ones (X0002USDT …) with volumes spread over ~4.5 decades,
+  so the prefilter drops a realistic share
+• Klines are re-timed on every request – the last one is the open candle
+• --latency / --jitter delay every response; --p429 answers that share of
+  requests with 429 + Retry-After; X-MBX-USED-WEIGHT-1M is reported and
+  --weight-limit enforces it like the real API
+• GET /__stats → requests / 429s served so far
+
+Run:   python replay_server.py --symbols 1000 --latency 0.05
+Then:  BINANCE_FAPI=http://127.0.0.1:8766 python hourly_volume_alert.py
+"""
+
+import argparse
+import json
+import os
+import random
+import threading
+import time
+from collections import Counter, deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from binance_limiter import endpoint_weight
+from multi_interval import INTERVAL_MS
+
+HOUR_MS = 3_600_000
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                        "fixtures", "binance")
+DECADES = 4.5                   # spread of synthetic volumes below the template
+
+
+def _load(root: str, stem: str):
+    with open(os.path.join(root, f"{stem}.json")) as f:
+        return json.load(f)
+
+# ────────────────────────── universe ────────────────────────────
+
+
+class Universe:
+    """Fixture responses, scaled to *n* symbols."""
+
+    def __init__(self, root: str = FIXTURES, n: int = 0):
+        info = _load(root, "exchangeInfo")
+        tickers = {t["symbol"]: t for t in _load(root, "ticker24hr")}
+        premium = {p["symbol"]: p for p in _load(root, "premiumIndex")}
+        recorded = [s for s in info["symbols"]
+                    if s["contractType"] == "PERPETUAL"
+                    and s["quoteAsset"] == "USDT" and s["status"] == "TRADING"]
+        templates = [s for s in recorded
+                     if os.path.exists(os.path.join(root, f"klines_{s['symbol']}.json"))]
+        self.klines = {s["symbol"]: _load(root, f"klines_{s['symbol']}")
+                       for s in templates}
+
+        # symbol → (template symbol, volume scale)
+        self.symbols: dict[str, tuple[str, float]] = {
+            s["symbol"]: (s["symbol"], 1.0) for s in recorded if s in templates}
+        n = n or len(self.symbols)
+        for i in range(len(self.symbols), n):
+            tpl = templates[i % len(templates)]["symbol"]
+            # golden-ratio steps → evenly spread, deterministic scales
+            self.symbols[f"X{i:04d}USDT"] = tpl, 10 ** -((i * 0.618034) % 1 * DECADES)
+        self.symbols = dict(list(self.symbols.items())[:n])
+
+        entries = {s["symbol"]: s for s in info["symbols"]}
+        others = [s for s in info["symbols"] if s not in recorded]
+        clones, ticks, prem = [], [], []
+        for sym, (tpl, scale) in self.symbols.items():
+            base = sym[:-4]
+            clones.append(dict(entries[tpl], symbol=sym, pair=sym, baseAsset=base))
+            t = tickers[tpl]
+            ticks.append(dict(t, symbol=sym,
+                              volume=f"{float(t['volume']) * scale:.3f}",
+                              quoteVolume=f"{float(t['quoteVolume']) * scale:.2f}"))
+            prem.append(dict(premium[tpl], symbol=sym))
+        ticks += [t for s, t in tickers.items() if s not in self.symbols]
+        self.info = json.dumps(dict(info, symbols=others + clones)).encode()
+        self.tickers = {t["symbol"]: t for t in ticks}
+        self.premium = {p["symbol"]: p for p in prem}
+        self.tickers_body = json.dumps(ticks).encode()
+        self.premium_body = json.dumps(prem).encode()
+
+    def kline_rows(self, sym: str, interval: str, limit: int) -> list:
+        """The template's candles, scaled and re-timed to end at the open one."""
+        tpl, scale = self.symbols[sym]
+        rows = self.klines[tpl]
+        ms = INTERVAL_MS.get(interval, HOUR_MS)
+        f = scale * ms / HOUR_MS
+        last = int(time.time() * 1000) // ms * ms
+        out = []
+        for j in range(limit):
+            r = list(rows[(j - limit) % len(rows)])
+            r[0] = last - (limit - 1 - j) * ms
+            r[6] = r[0] + ms - 1
+            r[5] = f"{float(r[5]) * f:.3f}"
+            r[7] = f"{float(r[7]) * f:.2f}"
+            out.append(r)
+        return out
+
+# ─────────────────────────── server ─────────────────────────────
+
+
+class Replay:
+    """Per-server knobs and counters shared by the handler threads."""
+
+    def __init__(self, universe: Universe, latency: float, jitter: float,
+                 p429: float, retry_after: int, weight_limit: int, seed: int):
+        self.u = universe
+        self.latency = latency
+        self.jitter = jitter
+        self.p429 = p429
+        self.retry_after = retry_after
+        self.weight_limit = weight_limit
+        self.rng = random.Random(seed)
+        self.window: deque[tuple[float, int]] = deque()   # (t, weight), last 60 s
+        self.used = 0
+        self.served: Counter = Counter()
+        self.lock = threading.Lock()
+
+    def charge(self, weight: int) -> tuple[int, bool]:
+        """Book *weight*; (used weight this minute, whether to answer 429)."""
+        now = time.monotonic()
+        with self.lock:
+            while self.window and now - self.window[0][0] > 60:
+                self.used -= self.window.popleft()[1]
+            over = bool(self.weight_limit) and self.used + weight > self.weight_limit
+            inject = self.rng.random() < self.p429
+            if not (over or inject):
+                self.window.append((now, weight))
+                self.used += weight
+            return self.used, over or inject
+
+    def delay(self) -> float:
+        with self.lock:
+            return max(self.latency + self.rng.uniform(-self.jitter, self.jitter), 0)
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"           # keep-alive, like the real API
+    replay: Replay
+
+    def _send(self, code: int, body: bytes, headers: dict | None = None) -> None:
+        self.send_response(code)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for k, v in (headers or {}).items():
+            self.send_header(k, str(v))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _error(self, code: int, api_code: int, msg: str, headers=None) -> None:
+        self._send(code, json.dumps({"code": api_code, "msg": msg}).encode(),
+                   headers)
+
+    def do_GET(self):
+        rp = self.replay
+        u = urlparse(self.path)
+        q = {k: v[-1] for k, v in parse_qs(u.query).items()}
+        if u.path == "/__stats":
+            with rp.lock:
+                body = json.dumps({"served": dict(rp.served),
+                                   "used_weight_1m": rp.used}).encode()
+            return self._send(200, body)
+
+        time.sleep(rp.delay())
+        used, reject = rp.charge(endpoint_weight(self.path))
+        headers = {"X-MBX-USED-WEIGHT-1M": used}
+        with rp.lock:
+            rp.served["429" if reject else u.path] += 1
+        if reject:
+            headers["Retry-After"] = rp.retry_after
+            return self._error(429, -1003, "Too many requests; replay limit.",
+                               headers)
+
+        sym = q.get("symbol")
+        if u.path == "/fapi/v1/ping":
+            body = b"{}"
+        elif u.path == "/fapi/v1/exchangeInfo":
+            body = rp.u.info
+        elif u.path == "/fapi/v1/klines":
+            if sym not in rp.u.symbols:
+                return self._error(400, -1121, "Invalid symbol.", headers)
+            body = json.dumps(rp.u.kline_rows(sym, q.get("interval", "1h"),
+                                              int(q.get("limit", 500)))).encode()
+        elif u.path in ("/fapi/v1/ticker/24hr", "/fapi/v1/premiumIndex"):
+            if u.path.endswith("24hr"):
+                table, whole = rp.u.tickers, rp.u.tickers_body
+            else:
+                table, whole = rp.u.premium, rp.u.premium_body
+            if sym is None:
+                body = whole
+            elif sym in table:
+                body = json.dumps(table[sym]).encode()
+            else:
+                return self._error(400, -1121, "Invalid symbol.", headers)
+        else:
+            return self._error(404, -1000, f"No replay for {u.path}", headers)
+        self._send(200, body, headers)
+
+    def log_message(self, *args):
+        pass
+
+
+def serve(replay: Replay, host: str, port: int) -> ThreadingHTTPServer:
+    handler = type("ReplayHandler", (Handler,), {"replay": replay})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    return server
+
+
+if __name__ == "__main__":
+    p = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    p.add_argument("--host", default="127.0.0.1")
+    p.add_argument("--port", type=int, default=8766)
+    p.add_argument("--fixtures", default=FIXTURES)
+    p.add_argument("--symbols", type=int, default=0,
+                   help="universe size (default: the fixture symbols)")
+    p.add_argument("--latency", type=float, default=0.0, help="seconds")
+    p.add_argument("--jitter", type=float, default=0.0, help="± seconds")
+    p.add_argument("--p429", type=float, default=0.0,
+                   help="share of requests answered with 429")
+    p.add_argument("--retry-after", type=int, default=1)
+    p.add_argument("--weight-limit", type=int, default=0,
+                   help="enforce this weight per minute (0 = report only)")
+    p.add_argument("--seed", type=int, default=1)
+    args = p.parse_args()
+
+    universe = Universe(args.fixtures, args.symbols)
+    replay = Replay(universe, args.latency, args.jitter, args.p429,
+                    args.retry_after, args.weight_limit, args.seed)
+    server = serve(replay, args.host, args.port)
+    print(f"Replaying {len(universe.symbols)} symbols on "
+          f"http://{args.host}:{server.server_port}", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("Served:", dict(replay.served))
@@ -0,0 +1,97 @@
+"""
+Drift-free wall-clock scheduler
+───────────────────────────────
+• Fires on multiples of *period* seconds (…:00, :05, :10 for 300 s),
+  computed from the boundary itself, not from when the last job ended
+• Sleeps in a few long naps, re-reading the clock each time, so NTP steps
+  are corrected and there's no wakeup every second
+• Every tick records lateness (start − boundary) and the job's overrun
+  past the next boundary; missed boundaries are collapsed into one
+  catch-up tick that still reports an hour close it skipped over
+"""
+
+import logging
+import time
+from collections import deque
+
+log = logging.getLogger(__name__)
+
+MAX_NAP = 60.0                  # s, longest single sleep before re-checking
+
+
+class Tick:
+    """One scheduled run."""
+
+    def __init__(self, scheduled: float, started: float, missed: int,
+                 top_of_hour: bool):
+        self.scheduled = scheduled           # boundary, epoch s
+        self.started = started               # when we actually woke, epoch s
+        self.lateness = started - scheduled
+        self.missed = missed                 # boundaries skipped before this
+        self.top_of_hour = top_of_hour       # an hh:00 boundary is being served
+        self.duration = 0.0
+        self.overrun = 0.0
+
+    def __str__(self) -> str:
+        s = (f"{time.strftime('%H:%M:%S', time.gmtime(self.scheduled))} UTC, "
+             f"late {self.lateness:.2f}s")
+        if self.missed:
+            s += f", caught up {self.missed} missed"
+        return s
+
+
+class BoundaryScheduler:
+    """Yields a Tick at every *period* boundary; see module docstring."""
+
+    def __init__(self, period: int = 300, history: int = 288):
+        self.period = period
+        self.history: deque[Tick] = deque(maxlen=history)
+
+    def _boundary(self, t: float) -> float:
+        return t // self.period * self.period
+
+    def _sleep_until(self, deadline: float) -> None:
+        while (rem := deadline - time.time()) > 0:
+            t0 = time.monotonic()
+            time.sleep(min(rem, MAX_NAP))
+            # a wall-clock step shows up as a gap between the two clocks
+            drift = (deadline - time.time()) - (rem - (time.monotonic() - t0))
+            if abs(drift) > 1:
+                log.warning("Clock stepped by %+.1fs, re-aligning", -drift)
+
+    def ticks(self):
+        """Run forever: the first tick serves the boundary just passed."""
+        due = self._boundary(time.time())
+        while True:
+            now = time.time()
+            latest = self._boundary(now)
+            missed = int((latest - due) // self.period)
+            hour_closed = any(
+                (due + i * self.period) % 3600 == 0 for i in range(missed + 1))
+            tick = Tick(latest, now, missed, hour_closed)
+
+            t0 = time.monotonic()
+            yield tick
+            tick.duration = time.monotonic() - t0
+
+            due = latest + self.period
+            tick.overrun = max(time.time() - due, 0.0)
+            self.history.append(tick)
+            if tick.overrun:
+                log.warning("Sweep overran the next boundary by %.1fs", tick.overrun,
+                            extra={"overrun": round(tick.overrun, 3)})
+            else:
+                log.info("Sweep took %.1fs; next check at %s UTC", tick.duration,
+                         time.strftime('%H:%M:%S', time.gmtime(due)),
+                         extra={"duration": round(tick.duration, 3)})
+                self._sleep_until(due)
+
+    def stats(self) -> dict:
+        """Lateness / overrun summary over the recent ticks."""
+        h = list(self.history)
+        if not h:
+            return {}
+        return {"ticks": len(h),
+                "max_late": max(t.lateness for t in h),
+                "max_overrun": max(t.overrun for t in h),
+                "missed": sum(t.missed for t in h)}
@@ -0,0 +1,199 @@
+"""
+Day-partitioned columnar store of market snapshots
+──────────────────────────────────────────────────
+• Every perp's 24 h quote volume, volume rank, price and funding rate,
+  one row per symbol per snapshot – the history the dashboard used to
+  throw away after rendering
+• snapshots/<YYYY-MM-DD>/<column>.bin – one raw little-endian array per
+  column, appended in place (never rewritten); a new UTC day starts a
+  new partition
+• Symbols are dictionary-encoded (int32 ids, snapshots/symbols.json)
+• query() / history() only open the partitions in the requested range
+  and memory-map them: the symbol column is scanned, the other columns
+  are only read where it matches
+• Appends take an flock on snapshots/.lock – the Streamlit app and
+  dashboard_server.py can record into the same directory
+
+A crash between column appends leaves the columns uneven; readers use
+the shortest, so a torn row is simply not there, and the next append
+truncates it away first.
+"""
+
+import fcntl
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+import numpy as np
+import pandas as pd
+
+import registry
+
+log = logging.getLogger(__name__)
+
+STORE_DIR = "snapshots"
+DAY_MS = 86_400_000
+
+COLUMNS = {
+    "ts": np.dtype("<i8"),          # snapshot time, ms
+    "sym": np.dtype("<i4"),         # id in symbols.json
+    "vol": np.dtype("<f8"),         # 24 h quote volume, USDT
+    "rank": np.dtype("<u2"),        # by 24 h volume, 1 = largest
+    "price": np.dtype("<f8"),
+    "funding": np.dtype("<f4"),     # last funding rate, %
+}
+VALUES = [c for c in COLUMNS if c not in ("ts", "sym")]
+
+
+def day(ts_ms: int) -> str:
+    return time.strftime("%Y-%m-%d", time.gmtime(ts_ms / 1000))
+
+
+class SnapshotStore:
+    """Append-only, day-partitioned column files under *root*."""
+
+    def __init__(self, root: str = STORE_DIR):
+        self.root = root
+        self.symbols: list[str] = []
+        self.ids: dict[str, int] = {}
+        self.lock = threading.Lock()
+        self.last_ts = 0                    # newest snapshot written by anyone
+        os.makedirs(root, exist_ok=True)
+        self._load_symbols()
+
+    # ── storage ──
+    def _path(self, part: str, col: str) -> str:
+        return os.path.join(self.root, part, f"{col}.bin")
+
+    def _load_symbols(self) -> None:
+        try:
+            with open(os.path.join(self.root, "symbols.json")) as f:
+                self.symbols = json.load(f)
+        except (OSError, ValueError):
+            self.symbols = []
+        self.ids = {s: i for i, s in enumerate(self.symbols)}
+
+    def _save_symbols(self) -> None:
+        path = os.path.join(self.root, "symbols.json")
+        with open(f"{path}.tmp", "w") as f:
+            json.dump(self.symbols, f)
+        os.replace(f"{path}.tmp", path)
+
+    @contextmanager
+    def _locked(self):
+        """Thread lock + flock, with the symbol table re-read from disk."""
+        with self.lock, open(os.path.join(self.root, ".lock"), "a") as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                self._load_symbols()             # another process may have added
+                yield
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+    def partitions(self) -> list[str]:
+        return sorted(d for d in os.listdir(self.root)
+                      if os.path.isdir(os.path.join(self.root, d)))
+
+    def _columns(self, part: str, cols) -> dict[str, np.ndarray]:
+        """Memory-mapped columns of one partition, cut to equal length."""
+        sizes = {c: os.path.getsize(self._path(part, c)) // COLUMNS[c].itemsize
+                 if os.path.exists(self._path(part, c)) else 0
+                 for c in COLUMNS}
+        n = min(sizes.values())
+        if n == 0:
+            return {c: np.empty(0, COLUMNS[c]) for c in cols}
+        return {c: np.memmap(self._path(part, c), dtype=COLUMNS[c], mode="r",
+                             shape=(n,)) for c in cols}
+
+    def _newest(self, part: str) -> int:
+        ts = self._columns(part, ["ts"])["ts"]
+        return int(ts[-1]) if len(ts) else 0
+
+    def _repair(self, part: str) -> None:
+        """Cut a torn append back to the last complete row (writer only)."""
+        n = len(self._columns(part, ["ts"])["ts"])
+        for c, dtype in COLUMNS.items():
+            path = self._path(part, c)
+            if os.path.exists(path) and os.path.getsize(path) > n * dtype.itemsize:
+                log.warning("Truncating torn %s to %d rows", path, n)
+                with open(path, "r+b") as f:
+                    f.truncate(n * dtype.itemsize)
+
+    # ── writing ──
+    def append(self, ts_ms: int, frame: pd.DataFrame,
+               min_interval_ms: int = 0) -> bool:
+        """Append one snapshot: *frame* has a "symbol" column plus VALUES.
+        Skipped (False) unless it is at least *min_interval_ms* newer than
+        the last one stored."""
+        if ts_ms - self.last_ts < max(min_interval_ms, 1):
+            return False
+        part = day(ts_ms)
+        with self._locked():
+            parts = self.partitions()
+            if parts:
+                self.last_ts = max(self.last_ts, self._newest(parts[-1]))
+            if ts_ms - self.last_ts < max(min_interval_ms, 1):
+                return False
+            new = [s for s in frame["symbol"].unique() if s not in self.ids]
+            if new:
+                self.ids.update((s, len(self.symbols) + i) for i, s in enumerate(new))
+                self.symbols += new
+                self._save_symbols()             # ids on disk before any row uses them
+            cols = {"ts": np.full(len(frame), ts_ms),
+                    "sym": frame["symbol"].map(self.ids).to_numpy()}
+            cols.update((c, frame[c].to_numpy()) for c in VALUES)
+            os.makedirs(os.path.join(self.root, part), exist_ok=True)
+            self._repair(part)
+            for c, dtype in COLUMNS.items():
+                with open(self._path(part, c), "ab") as f:
+                    f.write(np.ascontiguousarray(cols[c], dtype=dtype).tobytes())
+            self.last_ts = ts_ms
+        return True
+
+    # ── reading ──
+    def query(self, days: float, symbols=None, columns=VALUES,
+              now_ms: int | None = None) -> pd.DataFrame:
+        """Rows of the last *days* (optionally only *symbols*), oldest first:
+        time (UTC), symbol, *columns*."""
+        now_ms = int(time.time() * 1000) if now_ms is None else now_ms
+        since = now_ms - int(days * DAY_MS)
+        first = day(since)
+        with self.lock:
+            self._load_symbols()
+            ids = None if symbols is None else np.array(
+                [self.ids[s] for s in symbols if s in self.ids], dtype="<i4")
+        chunks = []
+        for part in self.partitions():
+            if part < first:
+                continue
+            cols = self._columns(part, ["ts", "sym", *columns])
+            keep = cols["ts"] >= since
+            if ids is not None:
+                keep &= np.isin(cols["sym"], ids)
+            idx = np.flatnonzero(keep)
+            chunks.append({c: np.asarray(a[idx]) for c, a in cols.items()})
+        if not chunks:
+            return pd.DataFrame(columns=["time", "symbol", *columns])
+        merged = {c: np.concatenate([ch[c] for ch in chunks]) for c in chunks[0]}
+        with self.lock:                 # after the rows: covers ids added meanwhile
+            self._load_symbols()
+            names = np.array(self.symbols, dtype=object)
+        df = pd.DataFrame({"time": pd.to_datetime(merged.pop("ts"), unit="ms"),
+                           "symbol": names[merged.pop("sym")]})
+        for c in columns:
+            df[c] = merged[c]
+        return df
+
+    def history(self, symbol: str, days: float = 7,
+                columns=VALUES) -> pd.DataFrame:
+        """*symbol* over the last *days*, indexed by snapshot time."""
+        df = self.query(days, [symbol], columns)
+        return df.drop(columns="symbol").set_index("time")
+
+
+def shared(root: str = STORE_DIR) -> SnapshotStore:
+    """Process-wide SnapshotStore per directory – survives Streamlit reruns."""
+    return registry.instance(SnapshotStore, root, root)
@@ -0,0 +1,238 @@
+"""
+Multi-rule volume spike detector with rolling baselines
+───────────────────────────────────────────────────────
+• Rolling window of closed hourly quote volumes per symbol (24–168 h)
+• Running sum / sum-of-squares / EMAs → mean, std, EMA in O(1) per candle;
+  the median comes from a bisect-maintained sorted copy of the window
+• Rules are evaluated against the candle being judged (open or just closed):
+    prev=K        curr ≥ K × previous closed hour   (the classic rule)
+    median=K      curr ≥ K × rolling median
+    zscore=Z      (curr − mean) / std ≥ Z
+    ema=F/S[xK]   fast EMA (incl. curr) crosses above K × slow EMA
+• Each rule fires at most once per symbol per hour
+
+Spec string, e.g.  "prev=3,median=4,zscore=4,ema=6/24x2"
+
+spike_mask() is the classic rule in array form, shared by the live scanner
+and the backtest.
+"""
+
+import math
+from bisect import bisect_left, insort
+from collections import deque
+
+import numpy as np
+
+WINDOW = 168                    # hours of history kept per symbol
+MIN_HISTORY = 24                # baseline rules stay quiet until this many
+VOLUME_MULTIPLE = 3
+MIN_QUOTE_VOL = 3_000_000
+HOUR_MS = 3_600_000
+
+# ─────────────────────── classic rule ───────────────────────────
+
+
+def spike_mask(prev_vol, curr_vol, open_ms, last_hour,
+               multiple: float = VOLUME_MULTIPLE,
+               min_vol: float = MIN_QUOTE_VOL, interval_ms: int = HOUR_MS):
+    """
+    curr ≥ multiple × prev and ≥ min_vol, not already alerted for this
+    candle – over whole (broadcastable) arrays in one pass.
+    Returns (ratio, spike, hour) arrays; hour is the candle's open time (ms).
+    """
+    prev_vol = np.asarray(prev_vol, dtype=float)
+    curr_vol = np.asarray(curr_vol, dtype=float)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ratio = np.where(prev_vol > 0, curr_vol / prev_vol, 0.0)
+    hour = np.asarray(open_ms, dtype=np.int64) // interval_ms * interval_ms
+    spike = ((ratio >= multiple) & (curr_vol >= min_vol)
+             & (hour != np.asarray(last_hour, dtype=np.int64)))
+    return ratio, spike, hour
+
+# ─────────────────────── rolling window ─────────────────────────
+
+
+class RollingWindow:
+    """Closed-candle volumes for one symbol with O(1) running statistics."""
+
+    def __init__(self, size: int = WINDOW, ema_spans: tuple = ()):
+        self.size = size
+        self.vols: deque[float] = deque()
+        self.sorted: list[float] = []
+        self.total = 0.0
+        self.total_sq = 0.0
+        self.last_open = -1
+        self.alphas = {span: 2 / (span + 1) for span in ema_spans}
+        self.emas: dict[int, float] = {}
+
+    def push(self, open_ms: int, vol: float) -> None:
+        """Append a closed candle; older or repeated candles are ignored."""
+        if open_ms <= self.last_open:
+            return
+        self.last_open = open_ms
+        self.vols.append(vol)
+        insort(self.sorted, vol)
+        self.total += vol
+        self.total_sq += vol * vol
+        if len(self.vols) > self.size:
+            old = self.vols.popleft()
+            del self.sorted[bisect_left(self.sorted, old)]
+            self.total -= old
+            self.total_sq -= old * old
+        for span, a in self.alphas.items():
+            ema = self.emas.get(span)
+            self.emas[span] = vol if ema is None else ema + a * (vol - ema)
+
+    def __len__(self) -> int:
+        return len(self.vols)
+
+    def prev(self) -> float:
+        return self.vols[-1] if self.vols else 0.0
+
+    def mean(self) -> float:
+        return self.total / len(self.vols) if self.vols else 0.0
+
+    def std(self) -> float:
+        n = len(self.vols)
+        if n < 2:
+            return 0.0
+        return math.sqrt(max(self.total_sq / n - self.mean() ** 2, 0.0))
+
+    def median(self) -> float:
+        n = len(self.sorted)
+        if not n:
+            return 0.0
+        mid = n // 2
+        return self.sorted[mid] if n % 2 else (self.sorted[mid - 1] + self.sorted[mid]) / 2
+
+    def ema_with(self, span: int, vol: float) -> float:
+        """EMA of *span* if *vol* were the next candle (not committed)."""
+        ema = self.emas.get(span, vol)
+        return ema + self.alphas[span] * (vol - ema)
+
+# ───────────────────────────── rules ────────────────────────────
+
+
+class Rule:
+    name = "rule"
+    min_history = 1
+    ema_spans: tuple = ()
+
+    def score(self, win: RollingWindow, vol: float):
+        """Rule statistic if the rule fires for *vol*, else None."""
+        raise NotImplementedError
+
+
+class PrevRatio(Rule):
+    name = "prev"
+
+    def __init__(self, multiple: float = 3):
+        self.multiple = multiple
+
+    def score(self, win, vol):
+        prev = win.prev()
+        ratio = vol / prev if prev else 0.0
+        return ratio if ratio >= self.multiple else None
+
+
+class MedianRatio(Rule):
+    name = "median"
+    min_history = MIN_HISTORY
+
+    def __init__(self, multiple: float = 4):
+        self.multiple = multiple
+
+    def score(self, win, vol):
+        med = win.median()
+        ratio = vol / med if med else 0.0
+        return ratio if ratio >= self.multiple else None
+
+
+class ZScore(Rule):
+    name = "zscore"
+    min_history = MIN_HISTORY
+
+    def __init__(self, threshold: float = 4):
+        self.threshold = threshold
+
+    def score(self, win, vol):
+        std = win.std()
+        z = (vol - win.mean()) / std if std else 0.0
+        return z if z >= self.threshold else None
+
+
+class EmaCross(Rule):
+    name = "ema"
+
+    def __init__(self, fast: int = 6, slow: int = 24, multiple: float = 1):
+        self.fast, self.slow, self.multiple = fast, slow, multiple
+        self.ema_spans = (fast, slow)
+        self.min_history = slow
+
+    def score(self, win, vol):
+        slow = win.emas.get(self.slow, 0.0) * self.multiple
+        before = win.emas.get(self.fast, 0.0)
+        after = win.ema_with(self.fast, vol)
+        if slow and before <= slow < after:
+            return after / slow * self.multiple
+        return None
+
+
+def parse_rules(spec: str) -> list[Rule]:
+    """'prev=3,median=4,zscore=4,ema=6/24x2' → rule objects."""
+    rules: list[Rule] = []
+    for part in filter(None, (p.strip() for p in spec.split(","))):
+        name, _, arg = part.partition("=")
+        if name == "prev":
+            rules.append(PrevRatio(float(arg or 3)))
+        elif name == "median":
+            rules.append(MedianRatio(float(arg or 4)))
+        elif name == "zscore":
+            rules.append(ZScore(float(arg or 4)))
+        elif name == "ema":
+            spans, _, mult = (arg or "6/24").partition("x")
+            fast, slow = (int(x) for x in spans.split("/"))
+            rules.append(EmaCross(fast, slow, float(mult or 1)))
+        else:
+            raise ValueError(f"Unknown rule: {name!r}")
+    return rules
+
+# ─────────────────────────── detector ───────────────────────────
+
+
+class Detector:
+    """Per-symbol windows + a rule set; dedupes each rule per symbol-hour."""
+
+    def __init__(self, rules: list[Rule], window: int = WINDOW,
+                 min_quote_vol: float = MIN_QUOTE_VOL):
+        self.rules = rules
+        self.window = window
+        self.min_quote_vol = min_quote_vol
+        self.spans = tuple(sorted({s for r in rules for s in r.ema_spans}))
+        self.windows: dict[str, RollingWindow] = {}
+        self.fired: dict[tuple[str, str], int] = {}
+
+    def win(self, sym: str) -> RollingWindow:
+        w = self.windows.get(sym)
+        if w is None:
+            w = self.windows[sym] = RollingWindow(self.window, self.spans)
+        return w
+
+    def observe(self, sym: str, open_ms: int, vol: float) -> None:
+        """Feed one closed candle (idempotent per open time)."""
+        self.win(sym).push(open_ms, vol)
+
+    def evaluate(self, sym: str, hour: int, vol: float) -> list[tuple[str, float]]:
+        """Rules firing for the candle opening at *hour* with volume *vol*."""
+        if vol < self.min_quote_vol:
+            return []
+        w = self.win(sym)
+        hits = []
+        for rule in self.rules:
+            if len(w) < rule.min_history or self.fired.get((sym, rule.name)) == hour:
+                continue
+            score = rule.score(w, vol)
+            if score is not None:
+                self.fired[sym, rule.name] = hour
+                hits.append((rule.name, score))
+        return hits
@@ -0,0 +1,105 @@
+"""
+Cached perpetual symbol universe
+────────────────────────────────
+• /fapi/v1/exchangeInfo is multi-MB – fetch it at most once per TTL
+• Binance USDT-M by default; other venues pass their own *fetch*
+  (see exchanges.py)
+• Last good snapshot persisted to disk → restarts don't pay for it
+• Built on market_data.MarketCache: a stale snapshot is served while one
+  background thread revalidates, and concurrent cold misses wait on a
+  single download
+• Endpoint failure keeps serving the last good snapshot; with none at
+  all yet, get() raises so the caller can report it
+
+exchangeInfo has no ETag / Last-Modified, so "conditional" here means
+TTL-gated: the payload is only downloaded once the snapshot has expired.
+"""
+
+import json
+import logging
+import os
+import time
+
+import requests
+
+import market_data
+import registry
+
+log = logging.getLogger(__name__)
+
+EXCHANGE_INFO_URL = "https://fapi.binance.com/fapi/v1/exchangeInfo"
+CACHE_FILE = "active_perps_cache.json"
+TTL_SECONDS = 60 * 60           # matches the dashboard's CACHE_MINUTES
+
+
+def fetch_active_perps(session: requests.Session,
+                       url: str = EXCHANGE_INFO_URL) -> list[str]:
+    """USDT-quoted PERPETUAL symbols whose status is TRADING (raises on error)."""
+    r = session.get(url, timeout=10)
+    r.raise_for_status()
+    info = r.json()
+    if "symbols" not in info:
+        raise ValueError(f"Unexpected response: {str(info)[:200]}")
+    return [
+        s["symbol"] for s in info["symbols"]
+        if s.get("contractType") == "PERPETUAL"
+        and s.get("quoteAsset") == "USDT"
+        and s.get("status") == "TRADING"
+    ]
+
+
+class SymbolUniverse(market_data.MarketCache):
+    """MarketCache of fetch_active_perps, persisted to disk – single-flight
+    on a cold miss, stale-while-revalidate after the TTL."""
+
+    def __init__(self, session: requests.Session, url: str = EXCHANGE_INFO_URL,
+                 path: str = CACHE_FILE, ttl: float = TTL_SECONDS,
+                 fetch=fetch_active_perps):
+        super().__init__(session, url, ttl)
+        self.fetch = fetch                        # (session, url) -> symbols
+        self.path = path
+        self._read()
+
+    @property
+    def symbols(self) -> list[str]:
+        return self.data or []
+
+    # ── persistence ──
+    def _read(self) -> None:
+        try:
+            with open(self.path) as f:
+                snap = json.load(f)
+            self.data = list(snap["symbols"]) or None
+            self.fetched_at = float(snap["fetched_at"])
+        except (OSError, ValueError, KeyError):
+            pass
+
+    def _save(self, symbols: list[str], fetched_at: float) -> None:
+        tmp = f"{self.path}.tmp"
+        try:
+            with open(tmp, "w") as f:
+                json.dump({"fetched_at": fetched_at, "symbols": symbols}, f)
+            os.replace(tmp, self.path)
+        except OSError as e:
+            log.warning("Symbol cache not persisted: %s", e)
+
+    # ── refresh ──
+    def _fetch(self) -> list[str]:
+        syms = self.fetch(self.session, self.url)
+        self._save(syms, time.time())
+        return syms
+
+    def get(self) -> list[str]:
+        """Current universe; only blocks when there is no snapshot at all,
+        and then concurrent callers share one download.  A failed cold
+        fetch raises."""
+        super().get()
+        return self.symbols
+
+
+def shared(session: requests.Session, url: str = EXCHANGE_INFO_URL,
+           path: str = CACHE_FILE, ttl: float = TTL_SECONDS,
+           fetch=fetch_active_perps) -> SymbolUniverse:
+    """Process-wide SymbolUniverse per (url, path) – survives Streamlit reruns."""
+    return registry.instance(SymbolUniverse, (url, path),
+                             session, url, path, ttl, fetch)
@@ -0,0 +1,143 @@
+"""
+Exchange adapter tests against fixtures/
+────────────────────────────────────────
+• Every venue's parsers on its fixture responses, checked against the
+  values written into those fixtures – normalised to USD notional
+• COIN-M volume = contracts × contract size, Bybit = turnover with its
+  newest-first klines reversed
+• Symbol keys round-trip through resolve()
+
+Run:  python -m pytest -q test_exchanges.py
+"""
+
+import json
+import os
+
+import pytest
+
+import exchanges
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+HOUR_MS = 3_600_000
+OPENS = [1717243200000 + i * HOUR_MS for i in range(4)]     # fixture candles
+
+
+def load(venue: str, stem: str):
+    with open(os.path.join(FIXTURES, venue, f"{stem}.json")) as f:
+        return json.load(f)
+
+
+@pytest.fixture
+def coinm():
+    ex = exchanges.BinanceCOINM("http://fixtures")
+    ex.parse_symbols(load("coinm", "exchangeInfo"))     # learns contract sizes
+    return ex
+
+
+# ── Binance USDT-M ──
+
+def test_binance_symbols_are_trading_usdt_perps():
+    ex = exchanges.BinanceUSDM("http://fixtures")
+    assert ex.parse_symbols(load("binance", "exchangeInfo")) == ["BTCUSDT", "ETHUSDT"]
+
+
+def test_binance_volumes_are_quote_volume():
+    vols = exchanges.BinanceUSDM("http://fixtures").parse_volumes(
+        load("binance", "ticker24hr"))
+    assert vols["BTCUSDT"] == 9_800_000_000.0
+    assert vols["ETHUSDT"] == 4_100_000_000.0
+
+
+def test_binance_klines_use_quote_volume():
+    kl = exchanges.BinanceUSDM("http://fixtures").parse_klines(
+        load("binance", "klines_BTCUSDT"), "BTCUSDT", "1h")
+    assert [k[0] for k in kl] == OPENS
+    assert all(c - o == HOUR_MS - 1 for o, c, _ in kl)
+    assert kl[0][2] == 410_000_000.0
+    assert kl[-1][2] == 1_320_000_000.0
+
+
+# ── Binance COIN-M ──
+
+def test_coinm_symbols_and_contract_sizes(coinm):
+    assert coinm.parse_symbols(load("coinm", "exchangeInfo")) == [
+        "BTCUSD_PERP", "ETHUSD_PERP"]       # no quarterlies, no DELIVERING
+    assert coinm.contract_size("BTCUSD_PERP") == 100.0
+    assert coinm.contract_size("ETHUSD_PERP") == 10.0
+
+
+def test_coinm_volumes_are_contracts_times_size(coinm):
+    vols = coinm.parse_volumes(load("coinm", "ticker24hr"))
+    assert vols["BTCUSD_PERP"] == 19_600_000 * 100.0
+    assert vols["ETHUSD_PERP"] == 48_500_000 * 10.0
+
+
+def test_coinm_klines_are_contracts_times_size(coinm):
+    btc = coinm.parse_klines(load("coinm", "klines_BTCUSD_PERP"), "BTCUSD_PERP", "1h")
+    eth = coinm.parse_klines(load("coinm", "klines_ETHUSD_PERP"), "ETHUSD_PERP", "1h")
+    assert [k[0] for k in btc] == OPENS
+    assert btc[0][2] == 812_000 * 100.0
+    assert btc[-1][2] == 2_950_000 * 100.0
+    assert eth[0][2] == 2_100_000 * 10.0
+    assert eth[-1][2] == 1_890_000 * 10.0
+
+
+def test_coinm_contract_size_without_exchange_info():
+    ex = exchanges.BinanceCOINM("http://fixtures")     # symbols from disk cache
+    assert ex.contract_size("BTCUSD_PERP") == 100.0
+    assert ex.contract_size("ETHUSD_PERP") == 10.0
+
+
+# ── Bybit linear ──
+
+def test_bybit_symbols_are_trading_usdt_perps():
+    ex = exchanges.BybitLinear("http://fixtures")
+    assert ex.parse_symbols(load("bybit", "exchangeInfo")) == ["BTCUSDT", "SOLUSDT"]
+
+
+def test_bybit_volumes_are_turnover():
+    vols = exchanges.BybitLinear("http://fixtures").parse_volumes(
+        load("bybit", "ticker24hr"))
+    assert vols["BTCUSDT"] == 4_400_000_000.0
+    assert vols["SOLUSDT"] == 1_100_000_000.0
+
+
+def test_bybit_klines_reversed_to_oldest_first():
+    kl = exchanges.BybitLinear("http://fixtures").parse_klines(
+        load("bybit", "klines_BTCUSDT"), "BTCUSDT", "1h")
+    assert [k[0] for k in kl] == OPENS
+    assert all(c - o == HOUR_MS - 1 for o, c, _ in kl)
+    assert kl[0][2] == 190_000_000.0                    # last in the payload
+    assert kl[-1][2] == 640_000_000.0                   # first in the payload
+
+
+def test_bybit_error_payload_raises():
+    with pytest.raises(ValueError, match="10001"):
+        exchanges.BybitLinear("http://fixtures").parse_volumes(
+            {"retCode": 10001, "retMsg": "params error"})
+
+
+# ── symbol keys ──
+
+@pytest.mark.parametrize("venue, sym, key", [
+    ("binance", "BTCUSDT", "BTCUSDT"),
+    ("coinm", "BTCUSD_PERP", "coinm:BTCUSD_PERP"),
+    ("bybit", "SOLUSDT", "bybit:SOLUSDT"),
+])
+def test_keys_resolve_to_venue_and_symbol(venue, sym, key):
+    ex = exchanges.VENUES[venue]
+    assert ex.key(sym) == key
+    assert exchanges.resolve(key) == (ex, sym)
+
+
+def test_unknown_prefix_resolves_to_binance():
+    assert exchanges.resolve("BTCUSDT") == (exchanges.VENUES["binance"], "BTCUSDT")
+    assert exchanges.resolve("okx:BTCUSDT") == (exchanges.VENUES["binance"],
+                                                "okx:BTCUSDT")
+
+
+def test_parse_venues():
+    assert exchanges.parse_venues("binance, bybit") == [
+        exchanges.VENUES["binance"], exchanges.VENUES["bybit"]]
+    with pytest.raises(ValueError, match="okx"):
+        exchanges.parse_venues("binance,okx")
@@ -0,0 +1,114 @@
+"""
+Kline stream tests
+──────────────────
+• HourlyVolumeBook.update(): same-hour updates, hour rollover (adjacent
+  and across a gap), the late final of the previous hour, stale events
+• End to end: ws_stub_server.handler served in-process, kline_stream
+  consuming it, the spike rule firing exactly once
+
+Run:  python -m pytest -q test_kline_stream.py
+"""
+
+import asyncio
+import types
+
+import pytest
+
+import kline_stream
+import ws_stub_server
+from spike_rules import spike_mask
+
+HOUR_MS = kline_stream.HOUR_MS
+T = 1717243200000                               # an hour boundary
+
+
+@pytest.fixture
+def book():
+    b = kline_stream.HourlyVolumeBook()
+    b.seed("BTCUSDT", 2e6, 1e6, T)              # prev 2 M, curr 1 M at T
+    return b
+
+
+def test_first_event_waits_for_prev():
+    b = kline_stream.HourlyVolumeBook()
+    assert b.update("BTCUSDT", T, 1e6) is None
+    assert b.update("BTCUSDT", T, 2e6) is None             # prev still unknown
+
+
+def test_same_hour_update(book):
+    assert book.update("BTCUSDT", T, 5e6) == (2e6, 5e6, T)
+    assert book.update("BTCUSDT", T, 6e6) == (2e6, 6e6, T)
+
+
+def test_adjacent_hour_rolls_curr_into_prev(book):
+    assert book.update("BTCUSDT", T + HOUR_MS, 3e5) == (1e6, 3e5, T + HOUR_MS)
+
+
+def test_gap_rollover_makes_prev_unknown(book):
+    assert book.update("BTCUSDT", T + 2 * HOUR_MS, 3e5) is None
+    assert book.update("BTCUSDT", T + 2 * HOUR_MS, 4e5) is None
+    # the next adjacent hour knows its predecessor again
+    assert book.update("BTCUSDT", T + 3 * HOUR_MS, 1e5) == (4e5, 1e5,
+                                                            T + 3 * HOUR_MS)
+
+
+def test_late_final_of_previous_hour(book):
+    book.update("BTCUSDT", T + HOUR_MS, 3e5)               # prev = 1 M so far
+    assert book.update("BTCUSDT", T, 1.5e6) is None        # closing update
+    assert book.update("BTCUSDT", T + HOUR_MS, 4e5) == (1.5e6, 4e5, T + HOUR_MS)
+
+
+def test_stale_event_is_ignored(book):
+    assert book.update("BTCUSDT", T - 2 * HOUR_MS, 9e9) is None
+    assert book.book["BTCUSDT"] == [T - HOUR_MS, 2e6, T, 1e6]  # untouched
+
+
+def test_symbols_are_independent(book):
+    assert book.update("ETHUSDT", T, 1e6) is None
+    assert book.update("BTCUSDT", T, 7e6) == (2e6, 7e6, T)
+
+
+def test_stream_urls_chunk_by_max_streams():
+    syms = [f"X{i:04d}USDT" for i in range(kline_stream.MAX_STREAMS + 1)]
+    urls = kline_stream.stream_urls(syms, "ws://stub/stream")
+    assert len(urls) == 2
+    assert urls[1] == f"ws://stub/stream?streams={syms[-1].lower()}@kline_1h"
+
+
+def test_stream_from_stub_fires_spike_once():
+    pytest.importorskip("websockets")
+    from websockets.asyncio.server import serve
+
+    # BTC grows 1 M a tick against a 2 M previous hour, ETH 0.1 M
+    args = types.SimpleNamespace(base=2e6, spike="BTCUSDT", tick=0.0, ticks=20)
+    fired, last_alert = [], {}
+
+    def on_update(sym, prev_vol, curr_vol, open_ms):
+        ratio, spike, hour = spike_mask(prev_vol, curr_vol, open_ms,
+                                        last_alert.get(sym, -1))
+        if spike:
+            last_alert[sym] = int(hour)
+            fired.append((sym, float(ratio)))
+
+    async def main():
+        book = kline_stream.HourlyVolumeBook()
+        async with serve(lambda ws: ws_stub_server.handler(ws, args),
+                         "127.0.0.1", 0) as server:
+            port = server.sockets[0].getsockname()[1]
+            url = kline_stream.stream_urls(["BTCUSDT", "ETHUSDT"],
+                                           f"ws://127.0.0.1:{port}/stream")[0]
+            consumer = asyncio.create_task(kline_stream._run([url], book, on_update))
+            final = args.base * 0.5 * args.ticks
+            for _ in range(500):                    # until the last tick is in
+                row = book.book.get("BTCUSDT")
+                if row and row[3] == final:
+                    break
+                await asyncio.sleep(0.01)
+            consumer.cancel()
+            await asyncio.gather(consumer, return_exceptions=True)
+        return book
+
+    book = asyncio.run(main())
+    assert book.book["BTCUSDT"][1] == 2e6
+    assert [sym for sym, _ in fired] == ["BTCUSDT"]
+    assert fired[0][1] >= 3.0
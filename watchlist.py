@@ -0,0 +1,105 @@
+"""
+Watchlist exports
+─────────────────
+• One pass over the volume table renders every format:
+    tradingview_watchlist.txt        BINANCE:<base>USDT.P, one per line
+    tradingview_watchlist_tiers.txt  the same in ###sections by 24 h volume
+    watchlist.csv                    rank, asset, symbol, volume, price, funding
+    watchlist.json                   the same as a list of objects
+• A file is only rewritten when its content changed (SHA-1 compare),
+  through a temp file + os.replace – readers never see half a list, and
+  mtimes only move when the list did
+
+Usage:  files = watchlist.render(df)          # {file name: text}
+        changed = watchlist.write(files)      # names actually rewritten
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+
+log = logging.getLogger(__name__)
+
+TXT_FILE = "tradingview_watchlist.txt"
+TIERS_FILE = "tradingview_watchlist_tiers.txt"
+CSV_FILE = "watchlist.csv"
+JSON_FILE = "watchlist.json"
+
+# (lower bound, section name), largest first
+TIERS = [(1_000_000_000, "24h VOLUME ≥ $1B"),
+         (500_000_000, "24h VOLUME $500M – $1B"),
+         (250_000_000, "24h VOLUME $250M – $500M"),
+         (0, "24h VOLUME < $250M")]
+
+_hashes: dict[str, str] = {}              # path → SHA-1 of what's on disk
+_lock = threading.Lock()
+
+
+def render(df: pd.DataFrame) -> dict[str, str]:
+    """Every format from one numeric frame: Asset, "Volume (24h, $)",
+    "Price (USDT)", "Funding Rate (%)" – largest volume first."""
+    asset = df["Asset"].astype(str).to_numpy(dtype=object)
+    vol = df["Volume (24h, $)"].to_numpy(dtype=float)
+    price = df["Price (USDT)"].to_numpy(dtype=float)
+    funding = (df["Funding Rate (%)"].to_numpy(dtype=float)
+               if "Funding Rate (%)" in df else np.full(len(df), np.nan))
+    symbol = asset + "USDT"
+    tv = ("BINANCE:" + symbol + ".P").tolist()
+
+    bounds = np.array([b for b, _ in TIERS], dtype=float)
+    tier = (vol[:, None] < bounds[None, :]).sum(axis=1)   # 0 = top tier
+    sections = []
+    for i, (_, name) in enumerate(TIERS):
+        members = [s for s, t in zip(tv, tier) if t == i]
+        if members:
+            sections += [f"###{name}", *members]
+
+    table = pd.DataFrame({"rank": np.arange(1, len(df) + 1), "asset": asset,
+                          "symbol": symbol, "volume_24h": vol.round(2),
+                          "price": price, "funding_pct": funding.round(6)})
+    records = table.astype(object).where(table.notna(), None).to_dict("records")
+    return {
+        TXT_FILE: "\n".join(tv),
+        TIERS_FILE: "\n".join(sections),
+        CSV_FILE: table.to_csv(index=False),
+        JSON_FILE: json.dumps(records, indent=1),
+    }
+
+
+def _digest(text: str) -> str:
+    return hashlib.sha1(text.encode()).hexdigest()
+
+
+def _on_disk(path: str) -> str | None:
+    try:
+        with open(path, "rb") as f:
+            return hashlib.sha1(f.read()).hexdigest()
+    except OSError:
+        return None
+
+
+def write(files: dict[str, str], directory: str = ".") -> list[str]:
+    """Atomically rewrite the files whose content changed; return their names."""
+    changed = []
+    with _lock:
+        for name, text in files.items():
+            path = os.path.join(directory, name)
+            digest = _digest(text)
+            if path not in _hashes:
+                _hashes[path] = _on_disk(path)
+            if _hashes[path] == digest:
+                continue
+            tmp = f"{path}.tmp"
+            with open(tmp, "w") as f:
+                f.write(text)
+            os.replace(tmp, path)
+            _hashes[path] = digest
+            changed.append(name)
+    if changed:
+        log.info("Watchlists updated: %s", ", ".join(changed))
+    return changed
@@ -0,0 +1,66 @@
+"""
+Local stand-in for the Binance combined kline stream
+────────────────────────────────────────────────────
+• Serves /stream?streams=<sym>@kline_1h/… like fstream.binance.com
+• Per symbol: sends the previous hour as a closed candle, then the
+  current candle with quote volume growing every tick
+• The --spike symbol grows fast enough to clear the 3× / $3 M rule
+
+Run:   python ws_stub_server.py --spike BTCUSDT
+Then:  python hourly_volume_alert.py --stream --symbols BTCUSDT,ETHUSDT \\
+           --ws-url ws://127.0.0.1:8765/stream
+"""
+
+import argparse
+import asyncio
+import json
+import time
+from urllib.parse import parse_qs, urlparse
+
+HOUR_MS = 3_600_000
+
+
+def kline_event(sym: str, open_ms: int, quote_vol: float, closed: bool) -> str:
+    k = {"t": open_ms, "T": open_ms + HOUR_MS - 1, "s": sym, "i": "1h",
+         "q": f"{quote_vol:.2f}", "x": closed}
+    return json.dumps({"stream": f"{sym.lower()}@kline_1h",
+                       "data": {"e": "kline", "E": int(time.time() * 1000),
+                                "s": sym, "k": k}})
+
+
+async def handler(ws, args) -> None:
+    query = parse_qs(urlparse(ws.request.path).query)
+    streams = query.get("streams", [""])[0].split("/")
+    syms = [s.split("@")[0].upper() for s in streams if s]
+
+    curr_open = int(time.time() * 1000) // HOUR_MS * HOUR_MS
+    vols = dict.fromkeys(syms, 0.0)
+    for sym in syms:
+        await ws.send(kline_event(sym, curr_open - HOUR_MS, args.base, True))
+
+    for _ in range(args.ticks):
+        for sym in syms:
+            step = args.base * (0.5 if sym == args.spike else 0.05)
+            vols[sym] += step
+            await ws.send(kline_event(sym, curr_open, vols[sym], False))
+        await asyncio.sleep(args.tick)
+
+
+async def main(args) -> None:
+    from websockets.asyncio.server import serve
+
+    async with serve(lambda ws: handler(ws, args), args.host, args.port):
+        print(f"Stub kline stream on ws://{args.host}:{args.port}/stream")
+        await asyncio.Future()
+
+
+if __name__ == "__main__":
+    p = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    p.add_argument("--host", default="127.0.0.1")
+    p.add_argument("--port", type=int, default=8765)
+    p.add_argument("--base", type=float, default=2_000_000,
+                   help="previous-hour quote volume per symbol")
+    p.add_argument("--spike", default="BTCUSDT")
+    p.add_argument("--tick", type=float, default=0.25, help="seconds")
+    p.add_argument("--ticks", type=int, default=40)
+    asyncio.run(main(p.parse_args()))